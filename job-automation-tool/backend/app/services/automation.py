@@ -61,7 +61,10 @@ class AutomationManager:
                 job = await self.queue.get_next_job()
                 
                 if job:
-                    await self._process_job(job)
+                    try:
+                        await self._process_job(job)
+                    finally:
+                        await self.queue.ack_job(job["id"])
                 else:
                     # No jobs available, wait before checking again
                     await asyncio.sleep(5)
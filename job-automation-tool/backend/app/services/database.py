@@ -2,31 +2,108 @@ import asyncio
 import asyncpg
 import json
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 from loguru import logger
 from uuid import uuid4
 
 from ..models import JobCreate, JobResponse, JobStatus, ApplicationStats
 from ..core.config import settings
 
+# Prepared statements kept per connection (asyncpg reuses them for identical SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+# Hot queries, kept as constants so every call sends identical SQL and hits the statement cache
+_SQL_ADD_JOB = """
+INSERT INTO jobs (id, title, company, platform, url, description,
+                requirements, salary_range, location, status)
+VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+"""
+
+_SQL_UPDATE_JOB_STATUS = """
+UPDATE jobs
+SET status = $1, applied_at = NOW(), application_result = $2
+WHERE id = $3
+"""
+
+_SQL_APPLICATION_STATS = """
+SELECT
+    COUNT(*) as total,
+    COUNT(CASE WHEN status = 'completed' THEN 1 END) as successful,
+    COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed,
+    COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending,
+    COUNT(CASE WHEN status = 'processing' THEN 1 END) as processing
+FROM jobs
+"""
+
+_SQL_ALL_JOBS = "SELECT * FROM jobs ORDER BY created_at DESC"
+_SQL_JOBS_BY_STATUS = "SELECT * FROM jobs WHERE status = $1 ORDER BY created_at DESC"
+_SQL_DELETE_JOB = "DELETE FROM jobs WHERE id = $1"
+# TRUNCATE drops the table's pages outright instead of a per-row delete + WAL record
+_SQL_CLEAR_JOBS = "TRUNCATE TABLE jobs RESTART IDENTITY"
+
+# Column order of _SQL_ADD_JOB after the id, with VARCHAR limits from the jobs table (None = TEXT)
+_JOB_COLUMNS = (
+    ("title", 500), ("company", 255), ("platform", 100), ("url", None), ("description", None),
+    ("requirements", None), ("salary_range", 255), ("location", 255),
+)
+_REQUIRED_JOB_FIELDS = frozenset({"title", "company", "platform", "url"})
+
+def _job_row(job_id: str, job_data: Dict[str, Any]) -> Tuple:
+    """Build an _SQL_ADD_JOB row, truncating strings to their column limits"""
+    row = [job_id]
+    for column, limit in _JOB_COLUMNS:
+        value = job_data.get(column)
+        if value is None or value == "":
+            if column in _REQUIRED_JOB_FIELDS:
+                raise ValueError(f"missing required field '{column}'")
+            row.append(None)
+            continue
+        value = str(value)
+        row.append(value[:limit] if limit else value)
+    row.append("pending")
+    return tuple(row)
+
 class DatabaseManager:
     def __init__(self):
-        self.pool = None
+        self.pool_rw = None  # primary: all writes
+        self.pool_ro = None  # read replica when configured, otherwise the primary pool
+        
+    async def _create_pool(self, host: str, min_size: int, max_size: int):
+        """Create an asyncpg connection pool against the given host"""
+        return await asyncpg.create_pool(
+            host=host,
+            port=settings.database_port,
+            database=settings.database_name,
+            user=settings.database_user,
+            password=settings.database_password,
+            min_size=min_size,
+            max_size=max_size,
+            max_inactive_connection_lifetime=settings.database_pool_max_inactive_lifetime,
+            command_timeout=settings.database_command_timeout,
+            statement_cache_size=STATEMENT_CACHE_SIZE,
+            max_cached_statement_lifetime=0  # the SQL set is fixed; never expire cached statements
+        )
         
     async def initialize(self):
-        """Initialize database connection pool and create tables"""
+        """Initialize database connection pools and create tables"""
         try:
-            # Create connection pool
-            self.pool = await asyncpg.create_pool(
-                host=settings.database_host,
-                port=settings.database_port,
-                database=settings.database_name,
-                user=settings.database_user,
-                password=settings.database_password,
-                min_size=5,
-                max_size=20
+            # Create connection pools
+            self.pool_rw = await self._create_pool(
+                settings.database_host,
+                settings.database_pool_min_size,
+                settings.database_pool_max_size
             )
             
+            if settings.database_readonly_host:
+                self.pool_ro = await self._create_pool(
+                    settings.database_readonly_host,
+                    settings.database_readonly_pool_min_size,
+                    settings.database_readonly_pool_max_size
+                )
+                logger.info(f"📖 Read-only queries routed to {settings.database_readonly_host}")
+            else:
+                self.pool_ro = self.pool_rw
+            
             await self.create_tables()
             logger.info("✅ PostgreSQL database initialized successfully")
         except Exception as e:
@@ -85,34 +162,42 @@ class DatabaseManager:
             "CREATE INDEX IF NOT EXISTS idx_form_activity_domain ON form_activity(domain)"
         ]
         
-        async with self.pool.acquire() as connection:
+        async with self.pool_rw.acquire() as connection:
             for query in queries:
                 await connection.execute(query)
         
         logger.info("📊 PostgreSQL tables created/verified")
 
+    async def fetch_ro(self, query: str, *args) -> List[asyncpg.Record]:
+        """Run a read-only query on the read pool"""
+        async with self.pool_ro.acquire() as connection:
+            return await connection.fetch(query, *args)
+
+    async def fetchrow_ro(self, query: str, *args) -> Optional[asyncpg.Record]:
+        """Run a read-only single-row query on the read pool"""
+        async with self.pool_ro.acquire() as connection:
+            return await connection.fetchrow(query, *args)
+
+    async def execute_rw(self, query: str, *args) -> str:
+        """Run a write statement on the primary pool"""
+        async with self.pool_rw.acquire() as connection:
+            return await connection.execute(query, *args)
+
     async def add_job(self, job_id: str, job_data: Dict[str, Any]) -> str:
         """Add a new job to the database"""
         try:
-            query = """
-            INSERT INTO jobs (id, title, company, platform, url, description, 
-                            requirements, salary_range, location, status)
-            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
-            """
-            
-            async with self.pool.acquire() as connection:
-                await connection.execute(query,
-                    job_id,
-                    job_data["title"],
-                    job_data["company"], 
-                    job_data["platform"],
-                    job_data["url"],
-                    job_data.get("description"),
-                    job_data.get("requirements"),
-                    job_data.get("salary_range"),
-                    job_data.get("location"),
-                    "pending"
-                )
+            await self.execute_rw(_SQL_ADD_JOB,
+                job_id,
+                job_data["title"],
+                job_data["company"], 
+                job_data["platform"],
+                job_data["url"],
+                job_data.get("description"),
+                job_data.get("requirements"),
+                job_data.get("salary_range"),
+                job_data.get("location"),
+                "pending"
+            )
             
             logger.info(f"📝 Job added to database: {job_data['title']} at {job_data['company']}")
             return job_id
@@ -120,22 +205,49 @@ class DatabaseManager:
             logger.error(f"❌ Failed to add job to database: {e}")
             raise
 
+    async def add_jobs_bulk(self, jobs: List[Tuple[str, Dict[str, Any]]]) -> List[str]:
+        """Add many (job_id, job_data) pairs in one transaction, returning the ids stored"""
+        rows = []
+        for job_id, job_data in jobs:
+            try:
+                rows.append(_job_row(job_id, job_data))
+            except ValueError as e:
+                logger.warning(f"⚠️ Skipping job {job_id}: {e}")
+        if not rows:
+            return []
+        
+        try:
+            async with self.pool_rw.acquire() as connection:
+                try:
+                    async with connection.transaction():
+                        await connection.executemany(_SQL_ADD_JOB, rows)
+                    stored = [row[0] for row in rows]
+                except asyncpg.PostgresError as e:
+                    # One bad row rolls back the batch; insert row by row so the good ones still land
+                    logger.warning(f"⚠️ Bulk job insert failed ({e}), retrying row by row")
+                    stored = []
+                    for row in rows:
+                        try:
+                            await connection.execute(_SQL_ADD_JOB, *row)
+                            stored.append(row[0])
+                        except asyncpg.PostgresError as row_error:
+                            logger.error(f"❌ Failed to add job {row[0]} to database: {row_error}")
+            
+            logger.info(f"📝 {len(stored)} jobs added to database")
+            return stored
+        except Exception as e:
+            logger.error(f"❌ Failed to add jobs to database: {e}")
+            raise
+
     async def update_job_status(self, job_id: str, status: JobStatus, 
                               result: Optional[Dict[str, Any]] = None):
         """Update job status and application result"""
         try:
-            query = """
-            UPDATE jobs 
-            SET status = $1, applied_at = NOW(), application_result = $2
-            WHERE id = $3
-            """
-            
-            async with self.pool.acquire() as connection:
-                await connection.execute(query,
-                    status.value,
-                    json.dumps(result) if result else None,
-                    job_id
-                )
+            await self.execute_rw(_SQL_UPDATE_JOB_STATUS,
+                status.value,
+                json.dumps(result) if result else None,
+                job_id
+            )
             
             logger.info(f"📊 Job status updated: {job_id} → {status.value}")
         except Exception as e:
@@ -145,18 +257,7 @@ class DatabaseManager:
     async def get_application_stats(self) -> ApplicationStats:
         """Get application statistics"""
         try:
-            query = """
-            SELECT 
-                COUNT(*) as total,
-                COUNT(CASE WHEN status = 'completed' THEN 1 END) as successful,
-                COUNT(CASE WHEN status = 'failed' THEN 1 END) as failed,
-                COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending,
-                COUNT(CASE WHEN status = 'processing' THEN 1 END) as processing
-            FROM jobs
-            """
-            
-            async with self.pool.acquire() as connection:
-                row = await connection.fetchrow(query)
+            row = await self.fetchrow_ro(_SQL_APPLICATION_STATS)
                 
             return ApplicationStats(
                 total=row[0] or 0,
@@ -172,10 +273,7 @@ class DatabaseManager:
     async def get_all_jobs(self) -> List[Dict[str, Any]]:
         """Get all jobs from database"""
         try:
-            query = "SELECT * FROM jobs ORDER BY created_at DESC"
-            
-            async with self.pool.acquire() as connection:
-                rows = await connection.fetch(query)
+            rows = await self.fetch_ro(_SQL_ALL_JOBS)
                 
             jobs = []
             for row in rows:
@@ -191,10 +289,7 @@ class DatabaseManager:
     async def get_jobs_by_status(self, status: str) -> List[Dict[str, Any]]:
         """Get jobs by status"""
         try:
-            query = "SELECT * FROM jobs WHERE status = $1 ORDER BY created_at DESC"
-            
-            async with self.pool.acquire() as connection:
-                rows = await connection.fetch(query, status)
+            rows = await self.fetch_ro(_SQL_JOBS_BY_STATUS, status)
                 
             jobs = []
             for row in rows:
@@ -209,15 +304,25 @@ class DatabaseManager:
     async def delete_job(self, job_id: str):
         """Delete a job from database"""
         try:
-            async with self.pool.acquire() as connection:
-                await connection.execute("DELETE FROM jobs WHERE id = $1", job_id)
+            await self.execute_rw(_SQL_DELETE_JOB, job_id)
             logger.info(f"🗑️ Job deleted: {job_id}")
         except Exception as e:
             logger.error(f"❌ Failed to delete job: {e}")
             raise
 
+    async def clear_jobs(self):
+        """Delete all jobs from database"""
+        try:
+            await self.execute_rw(_SQL_CLEAR_JOBS)
+            logger.info("🧹 All jobs deleted from database")
+        except Exception as e:
+            logger.error(f"❌ Failed to clear jobs: {e}")
+            raise
+
     async def cleanup(self):
-        """Close database connection pool"""
-        if self.pool:
-            await self.pool.close()
-            logger.info("🔌 Database connection pool closed")
\ No newline at end of file
+        """Close database connection pools"""
+        if self.pool_ro and self.pool_ro is not self.pool_rw:
+            await self.pool_ro.close()
+        if self.pool_rw:
+            await self.pool_rw.close()
+            logger.info("🔌 Database connection pools closed")
\ No newline at end of file
@@ -5,29 +5,43 @@ from datetime import datetime
 from uuid import uuid4
 from loguru import logger
 
-# Use in-memory queue for now to avoid Redis compatibility issues
-REDIS_AVAILABLE = False
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Redis lists: workers move jobs atomically from pending to inflight (BRPOPLPUSH)
+# and remove them from inflight once processed
+PENDING_KEY = "jobs:pending"
+INFLIGHT_KEY = "jobs:inflight"
 
 class JobQueueManager:
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    def __init__(self, redis_url: str = "redis://localhost:6379", use_redis: bool = False):
         self.redis_url = redis_url
         self.redis = None
         self.in_memory_queue = []
-        self.use_redis = False
+        self.use_redis = use_redis
+        self._inflight_payloads: Dict[str, str] = {}  # job ID -> raw Redis payload
         
     async def initialize(self, db_manager=None):
         """Initialize job queue (Redis or in-memory fallback)"""
-        if REDIS_AVAILABLE:
+        if self.use_redis and REDIS_AVAILABLE:
             try:
-                self.redis = await aioredis.from_url(self.redis_url)
+                self.redis = aioredis.from_url(self.redis_url)
                 await self.redis.ping()
-                self.use_redis = True
                 logger.info("✅ Redis job queue initialized")
             except Exception as e:
                 logger.warning(f"⚠️ Redis not available: {e}")
-                self.use_redis = False
-        else:
-            self.use_redis = False
+                self.redis = None
+        
+        self.use_redis = self.redis is not None
+        
+        if self.use_redis:
+            await self._requeue_inflight_jobs()
+            if await self.redis.llen(PENDING_KEY):
+                # Queue survived a restart; the database copy is already in it
+                db_manager = None
         
         # Load pending jobs from database into queue
         if db_manager:
@@ -40,16 +54,15 @@ class JobQueueManager:
         try:
             pending_jobs = await db_manager.get_jobs_by_status("pending")
             
-            for job_data in pending_jobs:
-                # Add to queue without creating new job ID
+            if pending_jobs:
+                # Add to queue without creating new job IDs
                 if self.use_redis:
-                    await self.redis.lpush("job_queue", json.dumps(job_data))
+                    # Rows carry datetimes (created_at), so stringify anything json can't encode;
+                    # one multi-value LPUSH for the whole batch
+                    await self.redis.lpush(PENDING_KEY, *(json.dumps(job_data, default=str) for job_data in pending_jobs))
                 else:
-                    self.in_memory_queue.append(job_data)
-            
-            if pending_jobs:
-                # Sort by priority
-                if not self.use_redis:
+                    self.in_memory_queue.extend(pending_jobs)
+                    # Sort by priority
                     self.in_memory_queue.sort(key=lambda x: x.get("priority", 0))
                 
                 logger.info(f"📥 Loaded {len(pending_jobs)} pending jobs into queue")
@@ -57,19 +70,36 @@ class JobQueueManager:
         except Exception as e:
             logger.warning(f"⚠️ Failed to load pending jobs: {e}")
 
-    async def add_job(self, job_data: Dict[str, Any]) -> str:
-        """Add job to queue and return job ID"""
-        job_id = str(uuid4())
-        job_entry = {
-            "id": job_id,
+    async def _requeue_inflight_jobs(self):
+        """Return jobs left in flight by a stopped worker to the front of the pending list"""
+        try:
+            requeued = 0
+            while await self.redis.rpoplpush(INFLIGHT_KEY, PENDING_KEY):
+                requeued += 1
+            
+            if requeued:
+                logger.info(f"♻️ Requeued {requeued} in-flight jobs")
+                
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to requeue in-flight jobs: {e}")
+
+    def _make_job_entry(self, job_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a queue entry, keeping the job's ID if it already has one (e.g. from the database)"""
+        return {
             **job_data,
+            "id": job_data.get("id") or str(uuid4()),
             "status": "pending",
             "created_at": datetime.now().isoformat(),
             "priority": self._calculate_priority(job_data)
         }
+
+    async def add_job(self, job_data: Dict[str, Any]) -> str:
+        """Add job to queue and return job ID"""
+        job_entry = self._make_job_entry(job_data)
+        job_id = job_entry["id"]
         
         if self.use_redis:
-            await self.redis.lpush("job_queue", json.dumps(job_entry))
+            await self.redis.lpush(PENDING_KEY, json.dumps(job_entry))
             logger.info(f"📥 Job added to Redis queue: {job_data['title']}")
         else:
             self.in_memory_queue.append(job_entry)
@@ -79,6 +109,23 @@ class JobQueueManager:
         
         return job_id
 
+    async def add_jobs(self, jobs_data: List[Dict[str, Any]]) -> List[str]:
+        """Add several jobs to queue at once and return their job IDs"""
+        job_entries = [self._make_job_entry(job_data) for job_data in jobs_data]
+        if not job_entries:
+            return []
+        
+        if self.use_redis:
+            await self.redis.lpush(PENDING_KEY, *(json.dumps(job_entry) for job_entry in job_entries))
+            logger.info(f"📥 {len(job_entries)} jobs added to Redis queue")
+        else:
+            self.in_memory_queue.extend(job_entries)
+            # Sort once for the whole batch (lower number = higher priority)
+            self.in_memory_queue.sort(key=lambda x: x.get("priority", 0))
+            logger.info(f"📥 {len(job_entries)} jobs added to memory queue")
+        
+        return [job_entry["id"] for job_entry in job_entries]
+
     def _calculate_priority(self, job_data: Dict[str, Any]) -> int:
         """Calculate job priority based on keywords and salary"""
         priority = 0
@@ -103,19 +150,27 @@ class JobQueueManager:
     async def get_next_job(self) -> Optional[Dict[str, Any]]:
         """Get next job from queue"""
         if self.use_redis:
-            job_data = await self.redis.brpop("job_queue", timeout=1)
-            if job_data:
-                return json.loads(job_data[1])
+            payload = await self.redis.brpoplpush(PENDING_KEY, INFLIGHT_KEY, timeout=1)
+            if payload:
+                job = json.loads(payload)
+                self._inflight_payloads[job["id"]] = payload
+                return job
         else:
             if self.in_memory_queue:
                 return self.in_memory_queue.pop(0)
         
         return None
 
+    async def ack_job(self, job_id: str):
+        """Mark a job taken with get_next_job as processed"""
+        payload = self._inflight_payloads.pop(job_id, None)
+        if self.use_redis and payload is not None:
+            await self.redis.lrem(INFLIGHT_KEY, 1, payload)
+
     async def get_all_jobs(self) -> List[Dict[str, Any]]:
         """Get all jobs in queue (for display purposes)"""
         if self.use_redis:
-            jobs_data = await self.redis.lrange("job_queue", 0, -1)
+            jobs_data = await self.redis.lrange(PENDING_KEY, 0, -1)
             return [json.loads(job) for job in jobs_data]
         else:
             return self.in_memory_queue.copy()
@@ -123,14 +178,15 @@ class JobQueueManager:
     async def remove_job(self, job_id: str):
         """Remove specific job from queue"""
         if self.use_redis:
-            # Redis removal is more complex, skip for now
-            pass
+            for payload in await self.redis.lrange(PENDING_KEY, 0, -1):
+                if json.loads(payload).get("id") == job_id:
+                    await self.redis.lrem(PENDING_KEY, 0, payload)
         else:
             self.in_memory_queue = [
                 job for job in self.in_memory_queue 
                 if job.get("id") != job_id
             ]
-            logger.info(f"🗑️ Job removed from queue: {job_id}")
+        logger.info(f"🗑️ Job removed from queue: {job_id}")
 
     async def get_queue_stats(self) -> Dict[str, int]:
         """Get queue statistics"""
@@ -147,7 +203,8 @@ class JobQueueManager:
     async def clear_queue(self):
         """Clear all jobs from queue"""
         if self.use_redis:
-            await self.redis.delete("job_queue")
+            await self.redis.delete(PENDING_KEY, INFLIGHT_KEY)
+            self._inflight_payloads.clear()
         else:
             self.in_memory_queue.clear()
         
@@ -67,14 +67,15 @@ class JobScraperService:
         unique_jobs = self._deduplicate_jobs(all_jobs)
         added_count = 0
         
-        for job in unique_jobs:
-            try:
-                job_id = await self.queue.add_job(job)
-                await self.db.add_job(job_id, job)
-                added_count += 1
-                logger.info(f"🎯 Scraped job added: {job['title']} at {job['company']}")
-            except Exception as e:
-                logger.error(f"❌ Failed to add scraped job: {e}")
+        try:
+            # One batched insert, then one queue update; only jobs stored in the database get queued
+            jobs = [{"id": str(uuid4()), **job} for job in unique_jobs]
+            stored_ids = set(await self.db.add_jobs_bulk([(job["id"], job) for job in jobs]))
+            jobs = [job for job in jobs if job["id"] in stored_ids]
+            await self.queue.add_jobs(jobs)
+            added_count = len(jobs)
+        except Exception as e:
+            logger.error(f"❌ Failed to add scraped jobs: {e}")
         
         logger.info(f"✅ Scraping completed: {added_count} jobs added")
         return unique_jobs
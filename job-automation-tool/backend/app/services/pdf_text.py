@@ -0,0 +1,16 @@
+"""
+PDF text extraction run inside the PDF worker processes (kept import-light for forkserver workers)
+"""
+
+from typing import Tuple
+
+import pymupdf
+
+def parse_pdf_pages(file_path: str, start: int, stop: int) -> Tuple[int, str]:
+    """Parse the text of pages [start, stop) and return it with the page count"""
+    # MuPDF reads the file itself; only the path crosses the process boundary
+    with pymupdf.open(file_path, filetype="pdf") as pdf_document:
+        page_count = len(pdf_document)
+        text = "\n".join(pdf_document[i].get_text("text") for i in range(start, min(stop, page_count)))
+    
+    return page_count, text
@@ -297,13 +297,15 @@ class RealJobScraperService:
 
     async def _save_scraped_jobs(self, jobs: List[Dict[str, Any]]):
         """Save scraped jobs to database and queue"""
-        for job in jobs:
-            try:
-                job_id = await self.queue.add_job(job)
-                await self.db.add_job(job_id, job)
-                logger.info(f"💾 Saved job: {job['title']} at {job['company']}")
-            except Exception as e:
-                logger.error(f"❌ Failed to save job: {e}")
+        try:
+            # One batched insert, then one queue update; only jobs stored in the database get queued
+            jobs = [{"id": str(uuid4()), **job} for job in jobs]
+            stored_ids = set(await self.db.add_jobs_bulk([(job["id"], job) for job in jobs]))
+            jobs = [job for job in jobs if job["id"] in stored_ids]
+            await self.queue.add_jobs(jobs)
+            logger.info(f"💾 Saved {len(jobs)} scraped jobs")
+        except Exception as e:
+            logger.error(f"❌ Failed to save scraped jobs: {e}")
 
     async def cleanup(self):
         """Cleanup scraper resources"""
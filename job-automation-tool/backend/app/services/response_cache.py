@@ -0,0 +1,94 @@
+"""
+Short-lived cache for hot read endpoints (Redis when enabled, in-memory fallback)
+"""
+
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from loguru import logger
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Upper bound on entries kept by the in-memory fallback (least recently used are evicted)
+MAX_MEMORY_ENTRIES = 256
+
+KEY_PREFIX = "cache:"
+
+class ResponseCache:
+    def __init__(self, redis_url: str = "redis://localhost:6379", use_redis: bool = False):
+        self.redis_url = redis_url
+        self.redis = None
+        self.use_redis = use_redis
+        self._memory: OrderedDict = OrderedDict()  # key -> (expires_at, value)
+
+    async def initialize(self):
+        """Connect to Redis if enabled, otherwise use the in-memory cache"""
+        if self.use_redis and REDIS_AVAILABLE:
+            try:
+                self.redis = aioredis.from_url(self.redis_url)
+                await self.redis.ping()
+                logger.info("✅ Redis response cache initialized")
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ Redis not available for response cache: {e}")
+                self.redis = None
+
+        self.use_redis = False
+        logger.info("✅ In-memory response cache initialized")
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss"""
+        try:
+            if self.use_redis:
+                raw = await self.redis.get(KEY_PREFIX + key)
+                return json.loads(raw) if raw is not None else None
+
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._memory[key]
+                return None
+            self._memory.move_to_end(key)
+            return value
+        except Exception as e:
+            logger.warning(f"⚠️ Response cache read failed for {key}: {e}")
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int):
+        """Cache a JSON-compatible value for ttl seconds"""
+        try:
+            if self.use_redis:
+                await self.redis.setex(KEY_PREFIX + key, ttl, json.dumps(value))
+                return
+
+            self._memory[key] = (time.monotonic() + ttl, value)
+            self._memory.move_to_end(key)
+            while len(self._memory) > MAX_MEMORY_ENTRIES:
+                self._memory.popitem(last=False)
+        except Exception as e:
+            logger.warning(f"⚠️ Response cache write failed for {key}: {e}")
+
+    async def invalidate(self, *keys: str):
+        """Drop cached values after a write"""
+        try:
+            if self.use_redis:
+                await self.redis.delete(*(KEY_PREFIX + key for key in keys))
+                return
+
+            for key in keys:
+                self._memory.pop(key, None)
+        except Exception as e:
+            logger.warning(f"⚠️ Response cache invalidation failed for {keys}: {e}")
+
+    async def cleanup(self):
+        """Cleanup resources"""
+        if self.redis:
+            await self.redis.close()
+            logger.info("🔌 Redis response cache connection closed")
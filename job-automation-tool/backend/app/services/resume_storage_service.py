@@ -5,13 +5,18 @@ Resume storage service for managing resume files and parsed data
 import os
 import json
 import shutil
-from typing import List, Optional, Dict, Any
+from typing import AsyncIterator, List, Optional, Dict, Any
 from datetime import datetime
+import aiofiles
 import aiosqlite
 from loguru import logger
 from app.models import ResumeRecord, ParsedResumeData, ResumeResponse, ResumeListResponse
 
 
+# Chunk size for streaming stored resume files back to clients
+RESUME_STREAM_CHUNK_SIZE = 64 * 1024
+
+
 class ResumeStorageService:
     def __init__(self, db_path: str = "app_data.db", uploads_dir: str = "uploads/resumes"):
         self.db_path = db_path
@@ -46,34 +51,15 @@ class ResumeStorageService:
             await db.commit()
             logger.info("Resume database tables initialized")
     
-    async def save_resume(self, resume_record: ResumeRecord, file_content: bytes) -> str:
-        """Save resume file and record to database"""
+    async def save_resume_from_file(self, resume_record: ResumeRecord, source_path: str) -> str:
+        """Save resume record to database, moving an already-written file into the uploads directory"""
         try:
-            # Save file to disk
+            # Move the streamed upload into place (a rename when on the same filesystem, no copy)
             file_path = os.path.join(self.uploads_dir, resume_record.filename)
-            with open(file_path, 'wb') as f:
-                f.write(file_content)
+            shutil.move(source_path, file_path)
             
             # Save record to database
-            parsed_data_json = resume_record.parsed_data.model_dump_json()
-            
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("""
-                    INSERT INTO resumes (
-                        id, filename, original_filename, upload_date,
-                        parsed_data, is_active, file_size, content_type
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    resume_record.id,
-                    resume_record.filename,
-                    resume_record.original_filename,
-                    resume_record.upload_date.isoformat(),
-                    parsed_data_json,
-                    resume_record.is_active,
-                    resume_record.file_size,
-                    resume_record.content_type
-                ))
-                await db.commit()
+            await self._insert_resume_record(resume_record)
             
             logger.info(f"Successfully saved resume: {resume_record.original_filename}")
             return resume_record.id
@@ -86,6 +72,28 @@ class ResumeStorageService:
             logger.error(f"Error saving resume: {e}")
             raise
     
+    async def _insert_resume_record(self, resume_record: ResumeRecord):
+        """Insert a resume record into the database"""
+        parsed_data_json = resume_record.parsed_data.model_dump_json()
+        
+        async with aiosqlite.connect(self.db_path) as db:
+            await db.execute("""
+                INSERT INTO resumes (
+                    id, filename, original_filename, upload_date,
+                    parsed_data, is_active, file_size, content_type
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                resume_record.id,
+                resume_record.filename,
+                resume_record.original_filename,
+                resume_record.upload_date.isoformat(),
+                parsed_data_json,
+                resume_record.is_active,
+                resume_record.file_size,
+                resume_record.content_type
+            ))
+            await db.commit()
+    
     async def get_resume_by_id(self, resume_id: str) -> Optional[ResumeRecord]:
         """Get resume record by ID"""
         try:
@@ -272,6 +280,21 @@ class ResumeStorageService:
             logger.error(f"Error getting resume file content: {e}")
             return None
     
+    def open_resume_stream(self, resume: ResumeRecord) -> Optional[AsyncIterator[bytes]]:
+        """Stream a resume's stored file in chunks, or None if the file is missing"""
+        file_path = os.path.join(self.uploads_dir, resume.filename)
+        if not os.path.exists(file_path):
+            logger.warning(f"Resume file not found: {file_path}")
+            return None
+        
+        return self._iter_file_chunks(file_path)
+    
+    async def _iter_file_chunks(self, file_path: str) -> AsyncIterator[bytes]:
+        """Yield a file's content in fixed-size chunks"""
+        async with aiofiles.open(file_path, 'rb') as f:
+            while chunk := await f.read(RESUME_STREAM_CHUNK_SIZE):
+                yield chunk
+    
     async def update_parsed_data(self, resume_id: str, parsed_data: ParsedResumeData) -> bool:
         """Update the parsed data for an existing resume"""
         try:
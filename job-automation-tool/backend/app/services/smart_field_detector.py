@@ -2,17 +2,30 @@
 Advanced Semantic Field Detection Service using NLP and ML techniques
 """
 import re
+import sys
 import json
 import nltk
 import spacy
 from typing import Dict, List, Any, Optional, Tuple
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 from loguru import logger
-import numpy as np
 import threading
-from functools import lru_cache
 import time
+from collections import Counter
+
+# Analysis cache keyed by hash(text) so long field text is not retained as a key
+_BASIC_CACHE_SIZE = 128
+_BASIC_CACHE: Dict[int, Dict[str, Dict[str, float]]] = {}
+_CACHE_LOCK = threading.Lock()  # detections run on worker threads; evict + insert must be atomic
+
+# How long a detection call waits on the background spaCy warmup before falling back
+NLP_PRELOAD_TIMEOUT = 0.5
+
+def _cache_put(cache: Dict[int, Any], key: int, value: Any, max_size: int):
+    """Insert into a bounded cache, evicting the oldest entry when full"""
+    with _CACHE_LOCK:
+        if key not in cache and len(cache) >= max_size:
+            cache.pop(next(iter(cache)))
+        cache[key] = value
 
 class SpacyModelCache:
     """Singleton class for caching spaCy models across instances"""
@@ -20,6 +33,7 @@ class SpacyModelCache:
     _lock = threading.Lock()
     _models = {}
     _load_times = {}
+    _failed_models = set()
     
     def __new__(cls):
         if cls._instance is None:
@@ -28,12 +42,13 @@ class SpacyModelCache:
                     cls._instance = super(SpacyModelCache, cls).__new__(cls)
         return cls._instance
     
-    @lru_cache(maxsize=2)
     def get_model(self, model_name: str):
-        """Get cached spaCy model with LRU caching"""
+        """Get cached spaCy model, loading it once per process"""
+        if model_name in self._failed_models:
+            return None
         if model_name not in self._models:
             with self._lock:
-                if model_name not in self._models:
+                if model_name not in self._models and model_name not in self._failed_models:
                     start_time = time.time()
                     try:
                         logger.info(f"🔄 Loading spaCy model: {model_name}")
@@ -46,6 +61,8 @@ class SpacyModelCache:
                         logger.info(f"✅ spaCy model loaded in {load_time:.2f}s with optimized pipeline")
                     except OSError as e:
                         logger.error(f"❌ Failed to load spaCy model {model_name}: {e}")
+                        # Remember the failure so later detections don't retry the load
+                        self._failed_models.add(model_name)
                         return None
         
         return self._models.get(model_name)
@@ -54,6 +71,7 @@ class SpacyModelCache:
         """Get model loading statistics"""
         return {
             'cached_models': list(self._models.keys()),
+            'failed_models': sorted(self._failed_models),
             'load_times': self._load_times,
             'cache_size': len(self._models)
         }
@@ -62,11 +80,13 @@ class SmartFieldDetector:
     def __init__(self):
         self.nlp = None
         self.field_embeddings = {}
-        self.known_patterns = {}
-        self.tfidf_vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+        self.known_patterns: Dict[str, Counter] = {}
         self._model_cache = SpacyModelCache()
+        self._nlp_load_attempted = False
         self._load_field_patterns()
-        # Lazy load spaCy model only when needed
+        # Warm up spaCy in the background so the first detection doesn't pay the load time
+        self._preload = threading.Thread(target=self._initialize_nlp, daemon=True)
+        self._preload.start()
         
     def _initialize_nlp(self):
         """Initialize NLP models with caching and lazy loading"""
@@ -75,70 +95,78 @@ class SmartFieldDetector:
             if self.nlp is None:
                 logger.warning("⚠️ spaCy model not available. Install with: python -m spacy download en_core_web_sm")
                 logger.warning("⚠️ Falling back to basic text processing without NLP features")
+        self._nlp_load_attempted = True
                 
     def _ensure_nlp_loaded(self):
         """Ensure NLP model is loaded (lazy loading)"""
-        if self.nlp is None:
+        if self._preload.is_alive():
+            # Model still warming up; use basic analysis rather than block the request
+            self._preload.join(timeout=NLP_PRELOAD_TIMEOUT)
+            if self._preload.is_alive():
+                return False
+        if self.nlp is None and not self._nlp_load_attempted:
             self._initialize_nlp()
         return self.nlp is not None
     
-    @lru_cache(maxsize=128)
     def _basic_text_analysis(self, text_content: str) -> Dict[str, Dict[str, float]]:
         """Basic text analysis fallback when NLP is not available"""
+        if not text_content:
+            return self._zero_scores
+        
+        key = hash(text_content)
+        cached = _BASIC_CACHE.get(key)
+        if cached is not None:
+            return cached
+        
         scores = {}
-        words = text_content.lower().split()
+        # Each distinct word is checked once and weighted by how often it occurs
+        word_counts = Counter(text_content.lower().split())
         
         for category, fields in self.field_patterns.items():
             if category not in scores:
                 scores[category] = {}
                 
             for field_type, patterns in fields.items():
-                semantic_keywords = patterns.get('semantic_keywords', [])
+                semantic_keywords = patterns['_sem_kw_lc']
+                single_word_keywords = patterns['_sem_kw_single']
                 
                 # Simple keyword matching
-                matches = sum(1 for word in words if any(keyword in word for keyword in semantic_keywords))
+                matches = sum(count for word, count in word_counts.items()
+                              if any(keyword in word for keyword in single_word_keywords))
                 score = matches / max(len(semantic_keywords), 1)
                 scores[category][field_type] = min(score, 1.0)
         
+        _cache_put(_BASIC_CACHE, key, scores, _BASIC_CACHE_SIZE)
         return scores
     
-    @lru_cache(maxsize=256)  
-    def _cached_semantic_analysis(self, text_hash: str, text_content: str) -> Dict[str, Dict[str, float]]:
-        """Cached semantic analysis for performance"""
-        return self._semantic_analysis_impl(text_content)
-    
-    def _semantic_analysis_impl(self, text_content: str) -> Dict[str, Dict[str, float]]:
-        """Implementation of semantic analysis"""
-        scores = {}
-        
-        if not self._ensure_nlp_loaded():
-            return self._basic_text_analysis(text_content)
-        
-        # Process with spaCy
-        doc = self.nlp(text_content)
-        
-        # Extract entities and keywords
-        entities = [(ent.text, ent.label_) for ent in doc.ents]
-        keywords = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
-        
-        # Score against known patterns
-        for category, fields in self.field_patterns.items():
-            if category not in scores:
-                scores[category] = {}
-                
-            for field_type, patterns in fields.items():
-                semantic_keywords = patterns.get('semantic_keywords', [])
-                
-                # Calculate semantic similarity
-                keyword_matches = sum(1 for kw in keywords if any(sem_kw in kw or kw in sem_kw for sem_kw in semantic_keywords))
-                entity_matches = sum(1 for ent_text, ent_label in entities if any(sem_kw in ent_text for sem_kw in semantic_keywords))
-                
-                # Normalize score
-                total_keywords = len(semantic_keywords)
-                semantic_score = (keyword_matches + entity_matches * 2) / max(total_keywords, 1)
-                semantic_score = min(semantic_score, 1.0)  # Cap at 1.0
-                
-                scores[category][field_type] = semantic_score
+    def _score_doc(self, doc) -> Dict[str, Dict[str, float]]:
+        """Score a spaCy doc against all field patterns in a single pass over its tokens"""
+        flat_patterns = self._flat_patterns
+        keyword_matches = [0] * len(flat_patterns)
+        entity_matches = [0] * len(flat_patterns)
+        
+        # Stream keywords straight from the doc instead of materializing a list per call
+        for token in doc:
+            if token.is_stop or token.is_punct:
+                continue
+            kw = token.lemma_
+            for i, (_, _, patterns) in enumerate(flat_patterns):
+                # Exact hits skip the substring scan
+                if kw in patterns['_sem_kw_set'] or any(sem_kw in kw or kw in sem_kw for sem_kw in patterns['_sem_kw_lc']):
+                    keyword_matches[i] += 1
+        
+        for ent in doc.ents:
+            ent_text = ent.text
+            for i, (_, _, patterns) in enumerate(flat_patterns):
+                if any(sem_kw in ent_text for sem_kw in patterns['_sem_kw_lc']):
+                    entity_matches[i] += 1
+        
+        scores = {category: {} for category in self.field_patterns}
+        for i, (category, field_type, patterns) in enumerate(flat_patterns):
+            # Normalize score
+            total_keywords = len(patterns['_sem_kw_lc'])
+            semantic_score = (keyword_matches[i] + entity_matches[i] * 2) / max(total_keywords, 1)
+            scores[category][field_type] = min(semantic_score, 1.0)  # Cap at 1.0
         
         return scores
             
@@ -246,6 +274,46 @@ class SmartFieldDetector:
                 }
             }
         }
+        self._normalize_field_patterns()
+        
+        # Flat (category, field_type, patterns) view for single-pass scoring loops
+        self._flat_patterns = [
+            (category, field_type, patterns)
+            for category, fields in self.field_patterns.items()
+            for field_type, patterns in fields.items()
+        ]
+        # Lookup tables mapping a flat score index back to its category / field type
+        self._cat_of = [category for category, _, _ in self._flat_patterns]
+        self._field_of = [field_type for _, field_type, _ in self._flat_patterns]
+        
+        # Shared all-zero result for analyzers with nothing to analyze (treat as read-only)
+        self._zero_scores = {
+            category: {field_type: 0.0 for field_type in fields}
+            for category, fields in self.field_patterns.items()
+        }
+
+    def _normalize_field_patterns(self):
+        """Pre-lowercase keyword lists and compile regexes once so analyzers don't redo it per call"""
+        # Intern category / field-type names so every score dict shares the same key objects
+        self.field_patterns = {
+            sys.intern(category): {sys.intern(field_type): patterns for field_type, patterns in fields.items()}
+            for category, fields in self.field_patterns.items()
+        }
+        
+        for fields in self.field_patterns.values():
+            for patterns in fields.values():
+                # Validation patterns are anchored, so callers use .match() rather than .search()
+                patterns['_validation_compiled'] = tuple(re.compile(p) for p in patterns.get('validation_patterns', []))
+                patterns['_validation_weight'] = patterns.get('confidence_weights', {}).get('validation', 0.0)
+                for source, target in (('semantic_keywords', '_sem_kw'),
+                                       ('context_clues', '_ctx_clues'),
+                                       ('visual_clues', '_vis_clues')):
+                    # Shortest first so substring checks short-circuit early
+                    lowered = tuple(sorted((k.lower() for k in patterns.get(source, [])), key=len))
+                    patterns[f'{target}_lc'] = lowered
+                    patterns[f'{target}_set'] = frozenset(lowered)
+                # A multi-word keyword can never be a substring of a single whitespace-split word
+                patterns['_sem_kw_single'] = tuple(k for k in patterns['_sem_kw_lc'] if ' ' not in k)
 
     def detect_field_type(self, field_element: Dict[str, Any], context: Dict[str, Any] = None) -> Tuple[str, str, float]:
         """
@@ -263,6 +331,7 @@ class SmartFieldDetector:
             contextual_analysis = self._contextual_analysis(field_info, context)
             visual_analysis = self._visual_analysis(field_info)
             pattern_analysis = self._pattern_analysis(field_info)
+            validation_analysis = self._validation_analysis(field_info)
             
             # Combine scores using weighted ensemble
             final_scores = self._ensemble_scoring([
@@ -270,7 +339,7 @@ class SmartFieldDetector:
                 contextual_analysis, 
                 visual_analysis,
                 pattern_analysis
-            ])
+            ], validation_analysis)
             
             # Get best prediction
             best_category, best_field_type, confidence = self._get_best_prediction(final_scores)
@@ -299,16 +368,12 @@ class SmartFieldDetector:
             'validation_pattern': field_element.get('pattern', ''),
             'required': field_element.get('required', False),
             'maxlength': field_element.get('maxlength', ''),
+            'value': field_element.get('value', ''),
             'context': context or {}
         }
 
     def _semantic_analysis(self, field_info: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
         """Advanced semantic analysis using NLP"""
-        scores = {}
-        
-        if not self.nlp:
-            return scores
-        
         # Combine all text information (filter out None values)
         text_parts = [
             field_info['id'] or '', field_info['name'] or '', field_info['placeholder'] or '',
@@ -316,41 +381,20 @@ class SmartFieldDetector:
         ]
         text_content = ' '.join(text_parts).lower().strip()
         
-        if not text_content.strip():
-            return scores
+        if not text_content:
+            return self._zero_scores
         
         # Process with spaCy (lazy loading)
         if not self._ensure_nlp_loaded():
-            # Fallback to basic analysis without NLP
-            logger.warning("⚠️ NLP model not available, using basic text analysis")
+            if self._nlp_load_attempted:
+                # Model is not installed; pattern and context analyses carry the detection
+                return {}
+            # Model still warming up; basic keyword scoring instead of blocking
             return self._basic_text_analysis(text_content)
         
         doc = self.nlp(text_content)
         
-        # Extract entities and keywords
-        entities = [(ent.text, ent.label_) for ent in doc.ents]
-        keywords = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
-        
-        # Score against known patterns
-        for category, fields in self.field_patterns.items():
-            if category not in scores:
-                scores[category] = {}
-                
-            for field_type, patterns in fields.items():
-                semantic_keywords = patterns.get('semantic_keywords', [])
-                
-                # Calculate semantic similarity
-                keyword_matches = sum(1 for kw in keywords if any(sem_kw in kw or kw in sem_kw for sem_kw in semantic_keywords))
-                entity_matches = sum(1 for ent_text, ent_label in entities if any(sem_kw in ent_text for sem_kw in semantic_keywords))
-                
-                # Normalize score
-                total_keywords = len(semantic_keywords)
-                semantic_score = (keyword_matches + entity_matches * 2) / max(total_keywords, 1)
-                semantic_score = min(semantic_score, 1.0)  # Cap at 1.0
-                
-                scores[category][field_type] = semantic_score
-        
-        return scores
+        return self._score_doc(doc)
 
     def _contextual_analysis(self, field_info: Dict[str, Any], context: Dict[str, Any] = None) -> Dict[str, Dict[str, float]]:
         """Analyze field based on context clues"""
@@ -361,14 +405,17 @@ class SmartFieldDetector:
         page_url = context.get('page_url', '') if context else ''
         form_purpose = context.get('form_purpose', '') if context else ''
         
-        context_text = f"{page_title} {page_url} {form_purpose} {field_info.get('surrounding_text', '')}".lower()
+        context_text = f"{page_title} {page_url} {form_purpose} {field_info.get('surrounding_text', '') or ''}".lower().strip()
+        
+        if not context_text:
+            return self._zero_scores
         
         for category, fields in self.field_patterns.items():
             if category not in scores:
                 scores[category] = {}
                 
             for field_type, patterns in fields.items():
-                context_clues = patterns.get('context_clues', [])
+                context_clues = patterns['_ctx_clues_lc']
                 
                 # Check for context clue matches
                 context_matches = sum(1 for clue in context_clues if clue in context_text)
@@ -385,12 +432,15 @@ class SmartFieldDetector:
         # Analyze classes and visual indicators
         classes_text = (field_info['classes'] or '').lower()
         
+        if not classes_text:
+            return self._zero_scores
+        
         for category, fields in self.field_patterns.items():
             if category not in scores:
                 scores[category] = {}
                 
             for field_type, patterns in fields.items():
-                visual_clues = patterns.get('visual_clues', [])
+                visual_clues = patterns['_vis_clues_lc']
                 
                 visual_matches = sum(1 for clue in visual_clues if clue in classes_text)
                 visual_score = visual_matches / max(len(visual_clues), 1)
@@ -410,6 +460,9 @@ class SmartFieldDetector:
         ]
         text_to_analyze = ' '.join(text_parts).lower().strip()
         
+        if not text_to_analyze:
+            return self._zero_scores
+        
         for category, fields in self.field_patterns.items():
             if category not in scores:
                 scores[category] = {}
@@ -430,54 +483,58 @@ class SmartFieldDetector:
         
         return scores
 
-    def _ensemble_scoring(self, analysis_results: List[Dict[str, Dict[str, float]]]) -> Dict[str, Dict[str, float]]:
-        """Combine multiple analysis results using ensemble method"""
-        combined_scores = {}
+    def _validation_analysis(self, field_info: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+        """Check the field's current value against each field type's validation patterns"""
+        scores = {}
         
-        # Get all categories and field types
-        all_categories = set()
-        for result in analysis_results:
-            all_categories.update(result.keys())
+        value = (field_info.get('value') or '').strip()
+        if not value:
+            return scores
         
-        for category in all_categories:
-            combined_scores[category] = {}
-            
-            # Get all field types for this category
-            field_types = set()
+        for category, fields in self.field_patterns.items():
+            scores[category] = {}
+            for field_type, patterns in fields.items():
+                compiled = patterns['_validation_compiled']
+                scores[category][field_type] = 1.0 if any(c.match(value) for c in compiled) else 0.0
+        
+        return scores
+
+    def _ensemble_scoring(self, analysis_results: List[Dict[str, Dict[str, float]]],
+                          validation_scores: Optional[Dict[str, Dict[str, float]]] = None) -> List[float]:
+        """Combine multiple analysis results into a flat score list aligned with _flat_patterns"""
+        combined_scores = []
+        result_count = len(analysis_results)
+        
+        # Walk the precomputed flat pattern list instead of rebuilding key sets per call
+        for category, field_type, patterns in self._flat_patterns:
+            # Sum scores from all analyses (missing entries count as 0.0)
+            total = 0.0
             for result in analysis_results:
-                if category in result:
-                    field_types.update(result[category].keys())
+                total += result.get(category, {}).get(field_type, 0.0)
             
-            for field_type in field_types:
-                # Collect scores from all analyses
-                scores = []
-                for result in analysis_results:
-                    if category in result and field_type in result[category]:
-                        scores.append(result[category][field_type])
-                    else:
-                        scores.append(0.0)
-                
-                # Use weighted average (can be made more sophisticated)
-                if scores:
-                    combined_score = np.mean(scores)
-                    combined_scores[category][field_type] = combined_score
+            # Plain average; NumPy dispatch costs more than the math on a few values
+            combined_score = total / result_count
+            
+            # A value that passes validation boosts the score by the field's validation weight
+            if validation_scores:
+                combined_score = min(combined_score + patterns['_validation_weight'] * validation_scores[category][field_type], 1.0)
+            
+            combined_scores.append(combined_score)
         
         return combined_scores
 
-    def _get_best_prediction(self, scores: Dict[str, Dict[str, float]]) -> Tuple[str, str, float]:
+    def _get_best_prediction(self, scores: List[float]) -> Tuple[str, str, float]:
         """Get the best field type prediction"""
-        best_score = 0.0
-        best_category = 'unknown'
-        best_field_type = 'unknown'
-        
-        for category, fields in scores.items():
-            for field_type, score in fields.items():
-                if score > best_score:
-                    best_score = score
-                    best_category = category
-                    best_field_type = field_type
-        
-        return best_category, best_field_type, best_score
+        if not scores:
+            return 'unknown', 'unknown', 0.0
+        
+        # C-level argmax over the flat list; ties resolve to the first pattern
+        best_index = max(range(len(scores)), key=scores.__getitem__)
+        best_score = scores[best_index]
+        if best_score <= 0.0:
+            return 'unknown', 'unknown', 0.0
+        
+        return self._cat_of[best_index], self._field_of[best_index], best_score
 
     def learn_from_correction(self, field_info: Dict[str, Any], correct_category: str, correct_field_type: str):
         """Learn from user corrections to improve future predictions"""
@@ -485,12 +542,9 @@ class SmartFieldDetector:
             # Extract features from the corrected field
             text_features = self._extract_text_features(field_info)
             
-            # Store the correction for future reference
+            # Accumulate token counts so memory is bounded by vocabulary, not corrections
             correction_key = f"{correct_category}_{correct_field_type}"
-            if correction_key not in self.known_patterns:
-                self.known_patterns[correction_key] = []
-            
-            self.known_patterns[correction_key].append(text_features)
+            self.known_patterns.setdefault(correction_key, Counter()).update(text_features)
             
             logger.info(f"📚 Learned from correction: {correct_category}.{correct_field_type}")
             
@@ -1,6 +1,7 @@
 """
 Computer Vision-based Form Analysis for enhanced field detection
 """
+import asyncio
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
@@ -8,17 +9,125 @@ import pytesseract
 from typing import Dict, List, Any, Tuple, Optional
 from loguru import logger
 import base64
-import io
+import hashlib
+import heapq
 import json
+import re
+import threading
+from collections import OrderedDict
+
+# Prefer tesserocr's persistent API (no per-call process spawn / language data reload)
+try:
+    from tesserocr import PyTessBaseAPI, OEM, PSM, RIL, iterate_level
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
+# Optional spatial index for DOM-to-visual matching on dense pages
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+# Common label patterns
+LABEL_INDICATORS = [
+    'name', 'email', 'phone', 'address', 'city', 'state', 'zip',
+    'company', 'title', 'experience', 'education', 'skills',
+    'password', 'username', 'first', 'last', 'middle',
+    'contact', 'information', 'required', '*', ':'
+]
+
+# Number of screenshots whose CV/OCR results are kept for repeat submissions
+SCREENSHOT_CACHE_SIZE = 64
+
+# Number of distinct image sizes whose workspace buffers are kept between calls
+WORKSPACE_CACHE_SIZE = 2
+
+# Idle workspace buffer sets kept per image size (extra sets from concurrent bursts are dropped)
+WORKSPACE_SETS_PER_SIZE = 2
+
+# Shortest line segment (screenshot pixels) treated as form structure
+MIN_LINE_LENGTH = 50
+
+# Thumbnail size (w, h) used for global color statistics
+COLOR_STATS_SIZE = (64, 64)
+
+# Rows per band for the morphology passes, sized so a band and its intermediates stay in L2
+MORPH_BAND_ROWS = 256
+
+# Edge-pixel fraction below which a screenshot is treated as blank (no fields, text or regions)
+MIN_EDGE_DENSITY = 0.002
+
+# Below this many candidates a single NumPy broadcast beats building a KD-tree
+KDTREE_MIN_CANDIDATES = 64
+
+# Longest side of the working image for the CV stages (OCR and input-box detection still run at
+# native resolution). Ordinary 1080p/1440p captures are analyzed natively: downscaling blurs
+# 1-2 px input borders until their edge rings no longer close. Only larger captures are reduced
+MAX_ANALYSIS_DIMENSION = 2560
+
+def _iou_batch(bbox: List[int], others: np.ndarray) -> np.ndarray:
+    """Overlap ratio (IoU) between one [x, y, w, h] box and an (N, 4) array of boxes"""
+    x1, y1, w1, h1 = bbox
+    x2, y2, w2, h2 = others.T
+    
+    # Calculate intersection
+    inter_w = np.clip(np.minimum(x1 + w1, x2 + w2) - np.maximum(x1, x2), 0, None)
+    inter_h = np.clip(np.minimum(y1 + h1, y2 + h2) - np.maximum(y1, y2), 0, None)
+    intersection_area = inter_w * inter_h
+    union_area = w1 * h1 + w2 * h2 - intersection_area
+    
+    return np.divide(intersection_area, union_area, out=np.zeros(len(others)), where=union_area > 0)
+
+def _center_dist_batch(bbox: List[int], others: np.ndarray) -> np.ndarray:
+    """Euclidean distance between the center of one [x, y, w, h] box and an (N, 4) array of boxes"""
+    x1, y1, w1, h1 = bbox
+    return np.hypot(others[:, 0] + others[:, 2] / 2 - (x1 + w1 / 2),
+                    others[:, 1] + others[:, 3] / 2 - (y1 + h1 / 2))
 
 class VisualFormAnalyzer:
     def __init__(self):
         self.field_detection_model = None
-        self.ocr_config = '--psm 6 -c tessedit_char_whitelist=ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789@.-_'
+        self.ocr_config = '--oem 1 --psm 6'  # LSTM engine only, single uniform block
+        self._tess_api = None
+        self._tess_lock = threading.Lock()  # PyTessBaseAPI is not thread-safe
+        self._label_re = re.compile('|'.join(map(re.escape, LABEL_INDICATORS)), re.IGNORECASE)
+        self._cache: OrderedDict = OrderedDict()
+        self._buffers: OrderedDict = OrderedDict()  # (h, w) -> free workspace buffer sets
+        self._use_opencl = False
+        self._lsd = None
+        self._lsd_lock = threading.Lock()  # the detector keeps per-image state
         self._initialize_models()
     
     def _initialize_models(self):
         """Initialize computer vision models"""
+        try:
+            # Route the image preprocessing through OpenCV's T-API when an OpenCL device exists
+            self._use_opencl = cv2.ocl.haveOpenCL()
+            if self._use_opencl:
+                cv2.ocl.setUseOpenCL(True)
+                logger.info(f"✅ OpenCL acceleration enabled ({cv2.ocl.Device.getDefault().name()})")
+        except Exception as e:
+            logger.warning(f"⚠️ OpenCL not available, using CPU preprocessing: {e}")
+            self._use_opencl = False
+        
+        try:
+            # LSD is missing from OpenCV 3.4.6-4.5.0 builds; HoughLinesP is used there instead
+            self._lsd = cv2.createLineSegmentDetector(cv2.LSD_REFINE_NONE)
+        except Exception as e:
+            logger.warning(f"⚠️ Line segment detector not available, using Hough lines: {e}")
+            self._lsd = None
+        
+        if TESSEROCR_AVAILABLE:
+            try:
+                self._tess_api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK, oem=OEM.LSTM_ONLY)
+                logger.info("✅ Tesseract OCR initialized (persistent tesserocr API)")
+                return
+            except Exception as e:
+                logger.warning(f"⚠️ tesserocr init failed, falling back to pytesseract: {e}")
+                self._tess_api = None
+        
         try:
             # Check if tesseract is available
             pytesseract.get_tesseract_version()
@@ -38,17 +147,64 @@ class VisualFormAnalyzer:
             Enhanced field analysis with visual context
         """
         try:
-            # Decode screenshot
-            image = self._decode_screenshot(screenshot_base64)
-            
-            # Extract visual features
-            visual_features = self._extract_visual_features(image)
-            
-            # Detect form regions
-            form_regions = self._detect_form_regions(image)
-            
-            # OCR analysis
-            ocr_results = self._perform_ocr(image)
+            # Identical screenshots reuse the CV/OCR results; only DOM matching is redone
+            cache_key = hashlib.blake2b(screenshot_base64.encode(), digest_size=16).digest()
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                visual_features, form_regions, ocr_results = cached
+            else:
+                # Decode screenshot
+                image = self._decode_screenshot(screenshot_base64)
+                
+                # Downscale once for the CV stages; results are mapped back to screenshot pixels
+                scale = min(1.0, MAX_ANALYSIS_DIMENSION / max(image.shape[:2]))
+                
+                if self._use_opencl:
+                    # Resize, grayscale and Canny run on the OpenCL device; results come back once
+                    small_image, gray, edges = self._preprocess_opencl(image, scale)
+                elif scale < 1.0:
+                    small_image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                else:
+                    small_image = image
+                
+                # Intermediate maps are written into reused workspace buffers instead of fresh arrays
+                size = small_image.shape[:2]
+                buffers = self._acquire_buffers(size)
+                try:
+                    if not self._use_opencl:
+                        # Grayscale and edge maps are computed once and shared by every CV stage
+                        gray = cv2.cvtColor(small_image, cv2.COLOR_BGR2GRAY, dst=buffers['gray'])
+                        edges = cv2.Canny(gray, 50, 150, edges=buffers['edges'], apertureSize=3)
+                    
+                    # Near-blank screenshots (e.g. an empty SPA section) skip the morphology and
+                    # component stages; countNonZero is a single cheap reduction
+                    has_edges = cv2.countNonZero(edges) >= MIN_EDGE_DENSITY * edges.size
+                    
+                    # Thin input borders don't survive the downscale, so boxes are found on a
+                    # native-resolution edge map
+                    field_edges = None
+                    if scale < 1.0 and has_edges:
+                        field_edges = cv2.Canny(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), 50, 150, apertureSize=3)
+                    
+                    # Feature extraction, form region detection and OCR are independent; OpenCV and
+                    # tesseract release the GIL, so running them on worker threads overlaps them and
+                    # keeps the event loop free
+                    stages = [
+                        asyncio.to_thread(self._extract_visual_features, small_image, gray, edges, scale,
+                                          buffers['connected'], has_edges, field_edges),
+                        asyncio.to_thread(self._perform_ocr, image)
+                    ]
+                    if has_edges:
+                        stages.append(asyncio.to_thread(self._detect_form_regions, gray, scale, buffers['morph']))
+                    visual_features, ocr_results, *rest = await asyncio.gather(*stages)
+                    form_regions = rest[0] if rest else []
+                finally:
+                    self._release_buffers(size, buffers)
+                
+                self._cache[cache_key] = (visual_features, form_regions, ocr_results)
+                if len(self._cache) > SCREENSHOT_CACHE_SIZE:
+                    self._cache.popitem(last=False)
             
             # Match DOM elements with visual elements
             enhanced_elements = self._match_dom_with_visual(dom_elements, visual_features, ocr_results)
@@ -73,12 +229,11 @@ class VisualFormAnalyzer:
             if ',' in screenshot_base64:
                 screenshot_base64 = screenshot_base64.split(',')[1]
             
-            # Decode base64
+            # Decode base64 straight into a BGR image (no PIL / RGB roundtrip)
             image_data = base64.b64decode(screenshot_base64)
-            image = Image.open(io.BytesIO(image_data))
-            
-            # Convert to OpenCV format
-            opencv_image = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+            opencv_image = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if opencv_image is None:
+                raise ValueError("Screenshot is not a decodable image")
             
             return opencv_image
             
@@ -86,63 +241,174 @@ class VisualFormAnalyzer:
             logger.error(f"❌ Screenshot decode error: {e}")
             raise
     
-    def _extract_visual_features(self, image: np.ndarray) -> Dict[str, Any]:
-        """Extract comprehensive visual features from form image"""
+    def _preprocess_opencl(self, image: np.ndarray, scale: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Downscale, grayscale and Canny on the OpenCL device, downloading each result once"""
+        umat = cv2.UMat(image)
+        if scale < 1.0:
+            umat = cv2.resize(umat, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(umat, cv2.COLOR_BGR2GRAY)
+        edges = cv2.Canny(gray, 50, 150, apertureSize=3)
+        
+        # Contour, component and OCR stages are CPU-only, so hand back plain arrays
+        return umat.get() if scale < 1.0 else image, gray.get(), edges.get()
+    
+    def _acquire_buffers(self, size: Tuple[int, int]) -> Dict[str, np.ndarray]:
+        """Take a free set of workspace buffers for this image size, allocating one if none is free"""
+        free = self._buffers.get(size)
+        if free:
+            self._buffers.move_to_end(size)
+            return free.pop()
+        # The OpenCL path gets gray and edge maps back from the device, so only the CPU path needs them
+        names = ('morph', 'connected') if self._use_opencl else ('gray', 'edges', 'morph', 'connected')
+        return {name: np.empty(size, dtype=np.uint8) for name in names}
+    
+    def _release_buffers(self, size: Tuple[int, int], buffers: Dict[str, np.ndarray]):
+        """Return workspace buffers for reuse, keeping a few sets for only the most recent image sizes"""
+        free = self._buffers.setdefault(size, [])
+        if len(free) < WORKSPACE_SETS_PER_SIZE:
+            free.append(buffers)
+        self._buffers.move_to_end(size)
+        while len(self._buffers) > WORKSPACE_CACHE_SIZE:
+            self._buffers.popitem(last=False)
+    
+    def _stats_to_screenshot_bboxes(self, stats: np.ndarray, scale: float) -> np.ndarray:
+        """Map connected-component x, y, w, h stats from the working image back to screenshot pixels"""
+        bboxes = stats[:, :4]
+        if scale == 1.0:
+            return bboxes
+        return np.round(bboxes / scale).astype(np.int32)
+    
+    def _outermost_components(self, labels: np.ndarray, stats: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+        """Drop candidates lying in a hole of another component (RETR_EXTERNAL semantics)"""
+        if not len(candidates):
+            return candidates
+        x, y, w, h = (stats[1:, k] for k in range(4))  # label 0 is the background
+        cx, cy, cw, ch = (stats[candidates, k][:, None] for k in range(4))
+        # A component inside another's hole has its bbox strictly inside that component's bbox;
+        # only those pairs need the exact test (bboxes of open shapes overlap without enclosing)
+        encloses = ((x <= cx) & (y <= cy) & (x + w >= cx + cw) & (y + h >= cy + ch)
+                    & (w * h > cw * ch))
+        
+        keep = np.ones(len(candidates), dtype=bool)
+        filled = {}  # label -> its outer contour filled in, i.e. the component plus its holes
+        for k in np.flatnonzero(encloses.any(axis=1)):
+            label = candidates[k]
+            # Any pixel of the candidate will do; its bbox's top row always contains one
+            px, py, pw = stats[label, 0], stats[label, 1], stats[label, 2]
+            px += int(np.argmax(labels[py, px:px + pw] == label))
+            for outer in np.flatnonzero(encloses[k]) + 1:
+                if outer not in filled:
+                    ox, oy, ow, oh = stats[outer, :4]
+                    mask = np.zeros((oh, ow), dtype=np.uint8)
+                    cv2.drawContours(mask, [self._component_contour(labels, stats[outer], outer)], -1, 1, cv2.FILLED)
+                    filled[outer] = mask
+                if filled[outer][py - stats[outer, 1], px - stats[outer, 0]]:
+                    keep[k] = False
+                    break
+        return candidates[keep]
+    
+    def _component_contour(self, labels: np.ndarray, stat: np.ndarray, label: int) -> np.ndarray:
+        """Outer contour of one connected component, traced only inside its bounding box"""
+        x, y, w, h = stat[:4]
+        roi = (labels[y:y + h, x:x + w] == label).astype(np.uint8)
+        contours, _ = cv2.findContours(roi, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        return max(contours, key=len)
+    
+    def _to_screenshot_bbox(self, rect: Tuple[int, int, int, int], scale: float) -> List[int]:
+        """Map a bounding rect from the downscaled working image back to screenshot pixels"""
+        if scale == 1.0:
+            return list(rect)
+        return [int(round(v / scale)) for v in rect]
+    
+    def _extract_visual_features(self, image: np.ndarray, gray: np.ndarray, edges: np.ndarray,
+                                 scale: float = 1.0, workspace: Optional[np.ndarray] = None,
+                                 has_edges: bool = True, field_edges: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """Extract comprehensive visual features from form image (downscaled by `scale`)"""
         try:
-            # Convert to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
-            # Detect edges
-            edges = cv2.Canny(gray, 50, 150, apertureSize=3)
-            
-            # Find contours (potential input fields)
-            contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            # Filter contours to find rectangular shapes (likely input fields)
-            potential_fields = []
-            for contour in contours:
-                # Approximate contour to polygon
-                epsilon = 0.02 * cv2.arcLength(contour, True)
-                approx = cv2.approxPolyDP(contour, epsilon, True)
-                
-                # Check if it's rectangular
-                if len(approx) == 4:
-                    x, y, w, h = cv2.boundingRect(contour)
-                    
-                    # Filter by size (likely input field dimensions)
-                    if w > 50 and h > 15 and w < 800 and h < 100:
-                        aspect_ratio = w / h
-                        area = cv2.contourArea(contour)
-                        
-                        potential_fields.append({
-                            'bbox': [x, y, w, h],
-                            'area': area,
-                            'aspect_ratio': aspect_ratio,
-                            'contour': contour.tolist(),
-                            'field_type': self._classify_field_by_shape(w, h, aspect_ratio)
-                        })
+            # Input field candidates, on the native-resolution edge map when the working image is
+            # downscaled (skipped when the edge map is essentially empty)
+            if not has_edges:
+                potential_fields = []
+            elif field_edges is not None:
+                potential_fields = self._detect_input_fields(field_edges)
+            else:
+                potential_fields = self._detect_input_fields(edges, scale)
             
             # Detect lines (form structure)
-            lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=100, minLineLength=50, maxLineGap=10)
+            lines = self._detect_lines(gray, edges, scale)
             
             # Color analysis
             color_features = self._analyze_colors(image)
             
             # Text region detection
-            text_regions = self._detect_text_regions(gray)
+            text_regions = self._detect_text_regions(gray, scale, workspace) if has_edges else []
             
             return {
                 'potential_fields': potential_fields,
-                'lines': lines.tolist() if lines is not None else [],
+                'lines': lines,  # (N, 4) int32 array of x1, y1, x2, y2
                 'color_features': color_features,
                 'text_regions': text_regions,
-                'image_dimensions': image.shape[:2]
+                'image_dimensions': tuple(int(round(d / scale)) for d in image.shape[:2])
             }
             
         except Exception as e:
             logger.error(f"❌ Visual feature extraction error: {e}")
             return {}
     
+    def _detect_input_fields(self, edges: np.ndarray, scale: float = 1.0) -> List[Dict[str, Any]]:
+        """Find rectangular edge blobs with input-field dimensions"""
+        # Label edge blobs (potential input fields); bbox stats for every blob come from one C call
+        _, labels, stats, _ = cv2.connectedComponentsWithStats(edges, connectivity=8)
+        bboxes = self._stats_to_screenshot_bboxes(stats, scale)
+        bw, bh = bboxes[:, 2], bboxes[:, 3]
+        
+        # Filter by size (likely input field dimensions) before any per-blob work
+        size_mask = (bw > 50) & (bh > 15) & (bw < 800) & (bh < 100)
+        size_mask[0] = False  # label 0 is the background
+        
+        # Check the outermost survivors for rectangular shapes (likely input fields)
+        potential_fields = []
+        for i in self._outermost_components(labels, stats, np.flatnonzero(size_mask)):
+            contour = self._component_contour(labels, stats[i], i)
+            
+            # Approximate contour to polygon
+            epsilon = 0.02 * cv2.arcLength(contour, True)
+            approx = cv2.approxPolyDP(contour, epsilon, True)
+            
+            # Check if it's rectangular
+            if len(approx) == 4:
+                x, y, w, h = bboxes[i].tolist()
+                aspect_ratio = w / h
+                area = cv2.contourArea(contour) / (scale * scale)
+                
+                potential_fields.append({
+                    'bbox': [x, y, w, h],
+                    'area': area,
+                    'aspect_ratio': aspect_ratio,
+                    'field_type': self._classify_field_by_shape(w, h, aspect_ratio)
+                })
+        
+        return potential_fields
+    
+    def _detect_lines(self, gray: np.ndarray, edges: np.ndarray, scale: float = 1.0) -> np.ndarray:
+        """Detect structural line segments as an (N, 4) int32 array in screenshot pixels"""
+        min_length = MIN_LINE_LENGTH * scale
+        if self._lsd is not None:
+            # LSD works on the gradients directly and only keeps well-aligned segments
+            with self._lsd_lock:
+                lines = self._lsd.detect(gray)[0]
+            if lines is not None:
+                lines = lines.reshape(-1, 4)
+                lengths = np.hypot(lines[:, 2] - lines[:, 0], lines[:, 3] - lines[:, 1])
+                lines = lines[lengths >= min_length]
+        else:
+            lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=100,
+                                    minLineLength=min_length, maxLineGap=10 * scale)
+        
+        if lines is None:
+            return np.empty((0, 4), dtype=np.int32)
+        return np.round(lines.reshape(-1, 4) / scale).astype(np.int32)
+    
     def _classify_field_by_shape(self, width: int, height: int, aspect_ratio: float) -> str:
         """Classify field type based on visual dimensions"""
         if aspect_ratio > 10:  # Very wide fields
@@ -157,21 +423,20 @@ class VisualFormAnalyzer:
         else:
             return 'standard_input'
     
-    def _detect_form_regions(self, image: np.ndarray) -> List[Dict[str, Any]]:
+    def _detect_form_regions(self, gray: np.ndarray, scale: float = 1.0,
+                             workspace: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """Detect major form regions using visual clustering"""
         try:
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            
             # Apply morphological operations to group related elements
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (20, 5))
-            morph = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, self._scaled_kernel((20, 5), scale))
+            morph = self._close_in_bands(gray, kernel, workspace)
             
             # Find contours of form regions
             contours, _ = cv2.findContours(morph, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
             
             form_regions = []
             for i, contour in enumerate(contours):
-                x, y, w, h = cv2.boundingRect(contour)
+                x, y, w, h = self._to_screenshot_bbox(cv2.boundingRect(contour), scale)
                 
                 # Filter for reasonable form section sizes
                 if w > 200 and h > 100:
@@ -189,6 +454,27 @@ class VisualFormAnalyzer:
             logger.error(f"❌ Form region detection error: {e}")
             return []
     
+    def _close_in_bands(self, gray: np.ndarray, kernel: np.ndarray,
+                        dst: Optional[np.ndarray] = None) -> np.ndarray:
+        """Morphological close over horizontal bands so dilate and erode run on cache-resident rows"""
+        height = gray.shape[0]
+        if dst is None:
+            dst = np.empty_like(gray)
+        
+        # Dilate then erode each reach kernel_h // 2 rows, so a halo of kernel_h rows keeps bands exact
+        halo = kernel.shape[0]
+        for top in range(0, height, MORPH_BAND_ROWS):
+            bottom = min(height, top + MORPH_BAND_ROWS)
+            halo_top, halo_bottom = max(0, top - halo), min(height, bottom + halo)
+            band = cv2.morphologyEx(gray[halo_top:halo_bottom], cv2.MORPH_CLOSE, kernel)
+            dst[top:bottom] = band[top - halo_top:bottom - halo_top]
+        
+        return dst
+    
+    def _scaled_kernel(self, size: Tuple[int, int], scale: float) -> Tuple[int, int]:
+        """Scale a structuring element size (given in screenshot pixels) to the working image"""
+        return tuple(max(1, int(round(v * scale))) for v in size)
+    
     def _estimate_field_count(self, width: int, height: int) -> int:
         """Estimate number of form fields in a region based on dimensions"""
         # Rough estimation based on typical field sizes
@@ -198,27 +484,22 @@ class VisualFormAnalyzer:
     def _perform_ocr(self, image: np.ndarray) -> Dict[str, Any]:
         """Perform OCR to extract text and labels"""
         try:
-            # Convert to PIL Image for OCR
-            pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
-            
-            # Get detailed OCR results
-            ocr_data = pytesseract.image_to_data(pil_image, output_type=pytesseract.Output.DICT, config=self.ocr_config)
+            # Get detailed OCR results as (text, bbox, confidence) words
+            if self._tess_api is not None:
+                words = self._ocr_words_tesserocr(image)
+            else:
+                words = self._ocr_words_pytesseract(image)
             
             # Process OCR results
             text_elements = []
-            for i in range(len(ocr_data['text'])):
-                if int(ocr_data['conf'][i]) > 30:  # Confidence threshold
-                    text = ocr_data['text'][i].strip()
+            for text, bbox, confidence in words:
+                if float(confidence) > 30:  # Confidence threshold
+                    text = text.strip()
                     if text:  # Non-empty text
                         text_elements.append({
                             'text': text,
-                            'bbox': [
-                                ocr_data['left'][i],
-                                ocr_data['top'][i],
-                                ocr_data['width'][i],
-                                ocr_data['height'][i]
-                            ],
-                            'confidence': ocr_data['conf'][i],
+                            'bbox': bbox,
+                            'confidence': confidence,
                             'likely_label': self._is_likely_label(text)
                         })
             
@@ -235,20 +516,43 @@ class VisualFormAnalyzer:
             logger.error(f"❌ OCR error: {e}")
             return {'all_text': [], 'field_labels': [], 'full_text': ''}
     
-    def _is_likely_label(self, text: str) -> bool:
-        """Determine if text is likely a form field label"""
-        # Common label patterns
-        label_indicators = [
-            'name', 'email', 'phone', 'address', 'city', 'state', 'zip',
-            'company', 'title', 'experience', 'education', 'skills',
-            'password', 'username', 'first', 'last', 'middle',
-            'contact', 'information', 'required', '*', ':'
-        ]
+    def _ocr_words_tesserocr(self, image: np.ndarray) -> List[Tuple[str, List[int], float]]:
+        """OCR via the persistent tesserocr API, feeding raw grayscale bytes (no PIL roundtrip)"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        height, width = gray.shape
+        
+        words = []
+        with self._tess_lock:
+            self._tess_api.SetImageBytes(gray.tobytes(), width, height, 1, width)
+            self._tess_api.Recognize()
+            for word in iterate_level(self._tess_api.GetIterator(), RIL.WORD):
+                text = word.GetUTF8Text(RIL.WORD)
+                if text is None:
+                    continue
+                x1, y1, x2, y2 = word.BoundingBox(RIL.WORD)
+                words.append((text, [x1, y1, x2 - x1, y2 - y1], word.Confidence(RIL.WORD)))
         
-        text_lower = text.lower()
+        return words
+    
+    def _ocr_words_pytesseract(self, image: np.ndarray) -> List[Tuple[str, List[int], Any]]:
+        """OCR via the pytesseract CLI wrapper"""
+        # Convert to PIL Image for OCR
+        pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        ocr_data = pytesseract.image_to_data(pil_image, output_type=pytesseract.Output.DICT, config=self.ocr_config)
         
-        # Check for label indicators
-        has_indicator = any(indicator in text_lower for indicator in label_indicators)
+        return [
+            (
+                ocr_data['text'][i],
+                [ocr_data['left'][i], ocr_data['top'][i], ocr_data['width'][i], ocr_data['height'][i]],
+                ocr_data['conf'][i]
+            )
+            for i in range(len(ocr_data['text']))
+        ]
+    
+    def _is_likely_label(self, text: str) -> bool:
+        """Determine if text is likely a form field label"""
+        # Check for label indicators (single compiled alternation instead of one scan per indicator)
+        has_indicator = self._label_re.search(text) is not None
         
         # Check for typical label formatting (ends with :, *, etc.)
         has_label_format = text.endswith((':', '*')) or '*' in text
@@ -261,22 +565,22 @@ class VisualFormAnalyzer:
     def _analyze_colors(self, image: np.ndarray) -> Dict[str, Any]:
         """Analyze color scheme to understand form styling"""
         try:
-            # Convert to different color spaces
-            hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
+            # Global statistics don't need full resolution: area-pool to a thumbnail first
+            thumbnail = cv2.resize(image, COLOR_STATS_SIZE, interpolation=cv2.INTER_AREA)
             
-            # Analyze dominant colors
-            pixels = image.reshape(-1, 3)
+            # Simple color analysis (cv2.mean is a single SIMD pass, no (H*W, 3) temporary)
+            mean_color = cv2.mean(thumbnail)[:3]
             
-            # Simple color analysis
-            mean_color = np.mean(pixels, axis=0)
-            dominant_hue = np.mean(hsv[:, :, 0])
+            # Hue of the mean color: a one-pixel HSV conversion instead of converting the whole image
+            mean_bgr = np.array(mean_color).round().astype(np.uint8).reshape(1, 1, 3)
+            dominant_hue = cv2.cvtColor(mean_bgr, cv2.COLOR_BGR2HSV)[0, 0, 0]
             
-            # Detect if it's a dark or light theme
-            brightness = np.mean(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY))
+            # Detect if it's a dark or light theme (BT.601 luma from the BGR means, no grayscale pass)
+            brightness = 0.114 * mean_color[0] + 0.587 * mean_color[1] + 0.299 * mean_color[2]
             theme = 'dark' if brightness < 128 else 'light'
             
             return {
-                'mean_color': mean_color.tolist(),
+                'mean_color': list(mean_color),
                 'dominant_hue': float(dominant_hue),
                 'theme': theme,
                 'brightness': float(brightness)
@@ -286,41 +590,43 @@ class VisualFormAnalyzer:
             logger.error(f"❌ Color analysis error: {e}")
             return {}
     
-    def _detect_text_regions(self, gray_image: np.ndarray) -> List[Dict[str, Any]]:
+    def _detect_text_regions(self, gray_image: np.ndarray, scale: float = 1.0,
+                             workspace: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """Detect regions likely to contain text"""
         try:
             # Use EAST text detector if available, otherwise use simple method
-            return self._simple_text_detection(gray_image)
+            return self._simple_text_detection(gray_image, scale, workspace)
             
         except Exception as e:
             logger.error(f"❌ Text region detection error: {e}")
             return []
     
-    def _simple_text_detection(self, gray_image: np.ndarray) -> List[Dict[str, Any]]:
+    def _simple_text_detection(self, gray_image: np.ndarray, scale: float = 1.0,
+                               workspace: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """Simple text region detection using morphological operations"""
         try:
             # Apply morphological operations to connect text
-            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1))
-            connected = cv2.morphologyEx(gray_image, cv2.MORPH_CLOSE, kernel)
-            
-            # Find contours
-            contours, _ = cv2.findContours(connected, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            
-            text_regions = []
-            for contour in contours:
-                x, y, w, h = cv2.boundingRect(contour)
-                
-                # Filter for text-like dimensions
-                if w > 20 and h > 8 and w < 500 and h < 50:
-                    aspect_ratio = w / h
-                    if 1 < aspect_ratio < 20:  # Text aspect ratio
-                        text_regions.append({
-                            'bbox': [x, y, w, h],
-                            'area': w * h,
-                            'aspect_ratio': aspect_ratio
-                        })
-            
-            return text_regions
+            kernel = cv2.getStructuringElement(cv2.MORPH_RECT, self._scaled_kernel((9, 1), scale))
+            connected = self._close_in_bands(gray_image, kernel, workspace)
+            
+            # Label connected blobs and filter their stats in one vectorized pass
+            _, _, stats, _ = cv2.connectedComponentsWithStats(connected, connectivity=8)
+            bboxes = self._stats_to_screenshot_bboxes(stats[1:], scale)  # label 0 is the background
+            bw, bh = bboxes[:, 2], bboxes[:, 3]
+            
+            # Filter for text-like dimensions and aspect ratio
+            mask = (bw > 20) & (bh > 8) & (bw < 500) & (bh < 50)
+            aspect_ratios = np.divide(bw, bh, out=np.zeros(len(bw)), where=mask)
+            mask &= (aspect_ratios > 1) & (aspect_ratios < 20)
+            
+            return [
+                {
+                    'bbox': [x, y, w, h],
+                    'area': w * h,
+                    'aspect_ratio': w / h
+                }
+                for x, y, w, h in bboxes[mask].tolist()
+            ]
             
         except Exception as e:
             logger.error(f"❌ Simple text detection error: {e}")
@@ -331,16 +637,26 @@ class VisualFormAnalyzer:
         try:
             enhanced_elements = []
             
+            # Stack candidate bboxes once so each DOM element is matched with a single broadcast
+            visual_fields = visual_features.get('potential_fields', [])
+            visual_bboxes = self._stack_bboxes(visual_fields)
+            field_labels = ocr_results.get('field_labels', [])
+            label_bboxes = self._stack_bboxes(field_labels)
+            
+            # On dense pages, index bbox centers so each DOM element only scores nearby candidates
+            visual_index = self._build_center_index(visual_bboxes)
+            label_index = self._build_center_index(label_bboxes)
+            
             for dom_element in dom_elements:
                 enhanced_element = dom_element.copy()
                 
                 # Try to match with visual fields
-                visual_match = self._find_closest_visual_match(dom_element, visual_features)
+                visual_match = self._find_closest_visual_match(dom_element, visual_fields, visual_bboxes, visual_index)
                 if visual_match:
                     enhanced_element['visual_features'] = visual_match
                 
                 # Try to match with OCR labels
-                label_match = self._find_closest_label_match(dom_element, ocr_results)
+                label_match = self._find_closest_label_match(dom_element, field_labels, label_bboxes, label_index)
                 if label_match:
                     enhanced_element['nearby_labels'] = label_match
                 
@@ -355,111 +671,88 @@ class VisualFormAnalyzer:
             logger.error(f"❌ DOM-Visual matching error: {e}")
             return dom_elements
     
-    def _find_closest_visual_match(self, dom_element: Dict, visual_features: Dict) -> Optional[Dict]:
+    def _stack_bboxes(self, items: List[Dict]) -> np.ndarray:
+        """Stack the [x, y, w, h] pixel bboxes of detected items into an (N, 4) int32 array"""
+        if not items:
+            return np.empty((0, 4), dtype=np.int32)
+        return np.asarray([item['bbox'] for item in items], dtype=np.int32)
+    
+    def _build_center_index(self, bboxes: np.ndarray) -> Optional[Tuple[Any, np.ndarray]]:
+        """KD-tree over bbox centers plus the largest bbox size, or None when a broadcast is cheaper"""
+        if not SCIPY_AVAILABLE or len(bboxes) < KDTREE_MIN_CANDIDATES:
+            return None
+        return cKDTree(bboxes[:, :2] + bboxes[:, 2:] / 2), bboxes[:, 2:].max(axis=0)
+    
+    def _query_center_index(self, index: Optional[Tuple[Any, np.ndarray]], bbox: List[int],
+                            radius: float) -> Optional[np.ndarray]:
+        """Ascending indices of bboxes whose center lies within `radius` of bbox's center (None = all)"""
+        if index is None:
+            return None
+        tree, _ = index
+        x, y, w, h = bbox
+        return np.asarray(tree.query_ball_point([x + w / 2, y + h / 2], r=radius, return_sorted=True),
+                          dtype=np.intp)
+    
+    def _find_closest_visual_match(self, dom_element: Dict, visual_fields: List[Dict], visual_bboxes: np.ndarray,
+                                   visual_index: Optional[Tuple[Any, np.ndarray]] = None) -> Optional[Dict]:
         """Find the closest visual field match for a DOM element"""
         try:
-            if 'bbox' not in dom_element:
+            if 'bbox' not in dom_element or not len(visual_bboxes):
                 return None
             
-            dom_bbox = dom_element['bbox']  # [x, y, width, height]
-            best_match = None
-            best_overlap = 0
+            bbox = dom_element['bbox']  # [x, y, width, height]
+            candidates = None
+            if visual_index is not None:
+                # Overlapping boxes have centers at most half of both sizes apart on each axis
+                max_w, max_h = visual_index[1]
+                radius = np.hypot((bbox[2] + max_w) / 2, (bbox[3] + max_h) / 2)
+                candidates = self._query_center_index(visual_index, bbox, radius)
+                if not len(candidates):
+                    return None
             
-            for visual_field in visual_features.get('potential_fields', []):
-                visual_bbox = visual_field['bbox']
-                
-                # Calculate overlap
-                overlap = self._calculate_bbox_overlap(dom_bbox, visual_bbox)
-                
-                if overlap > best_overlap and overlap > 0.3:  # Minimum overlap threshold
-                    best_overlap = overlap
-                    best_match = visual_field
+            overlaps = _iou_batch(bbox, visual_bboxes if candidates is None else visual_bboxes[candidates])
+            
+            # argmax keeps the first best field, matching the previous strict '>' scan
+            best_index = int(np.argmax(overlaps))
+            if overlaps[best_index] > 0.3:  # Minimum overlap threshold
+                return visual_fields[best_index if candidates is None else candidates[best_index]]
             
-            return best_match
+            return None
             
         except Exception as e:
             logger.error(f"❌ Visual matching error: {e}")
             return None
     
-    def _find_closest_label_match(self, dom_element: Dict, ocr_results: Dict) -> List[Dict]:
+    def _find_closest_label_match(self, dom_element: Dict, field_labels: List[Dict], label_bboxes: np.ndarray,
+                                  label_index: Optional[Tuple[Any, np.ndarray]] = None) -> List[Dict]:
         """Find nearby labels for a DOM element"""
         try:
-            if 'bbox' not in dom_element:
+            if 'bbox' not in dom_element or not len(label_bboxes):
                 return []
             
-            dom_bbox = dom_element['bbox']
-            nearby_labels = []
-            
-            for text_element in ocr_results.get('field_labels', []):
-                text_bbox = text_element['bbox']
-                
-                # Calculate distance between DOM element and text
-                distance = self._calculate_bbox_distance(dom_bbox, text_bbox)
-                
-                # Consider labels within reasonable proximity
-                if distance < 100:  # pixels
-                    nearby_labels.append({
-                        'text': text_element['text'],
-                        'distance': distance,
-                        'confidence': text_element['confidence']
-                    })
-            
-            # Sort by distance (closest first)
-            nearby_labels.sort(key=lambda x: x['distance'])
-            
-            return nearby_labels[:3]  # Return top 3 closest labels
+            candidates = self._query_center_index(label_index, dom_element['bbox'], 100)
+            if candidates is None:
+                candidates = np.arange(len(label_bboxes))
+            distances = _center_dist_batch(dom_element['bbox'], label_bboxes[candidates])
+            
+            # Consider labels within reasonable proximity; a bounded heap picks the 3 closest
+            # (nsmallest is stable, so equal distances keep OCR order)
+            nearby = heapq.nsmallest(3, np.flatnonzero(distances < 100).tolist(),  # pixels
+                                     key=distances.__getitem__)
+            
+            return [
+                {
+                    'text': field_labels[candidates[i]]['text'],
+                    'distance': float(distances[i]),
+                    'confidence': field_labels[candidates[i]]['confidence']
+                }
+                for i in nearby  # Return top 3 closest labels
+            ]
             
         except Exception as e:
             logger.error(f"❌ Label matching error: {e}")
             return []
     
-    def _calculate_bbox_overlap(self, bbox1: List[int], bbox2: List[int]) -> float:
-        """Calculate overlap ratio between two bounding boxes"""
-        try:
-            x1, y1, w1, h1 = bbox1
-            x2, y2, w2, h2 = bbox2
-            
-            # Calculate intersection
-            x_left = max(x1, x2)
-            y_top = max(y1, y2)
-            x_right = min(x1 + w1, x2 + w2)
-            y_bottom = min(y1 + h1, y2 + h2)
-            
-            if x_right < x_left or y_bottom < y_top:
-                return 0.0
-            
-            intersection_area = (x_right - x_left) * (y_bottom - y_top)
-            bbox1_area = w1 * h1
-            bbox2_area = w2 * h2
-            union_area = bbox1_area + bbox2_area - intersection_area
-            
-            return intersection_area / union_area if union_area > 0 else 0.0
-            
-        except Exception as e:
-            logger.error(f"❌ Overlap calculation error: {e}")
-            return 0.0
-    
-    def _calculate_bbox_distance(self, bbox1: List[int], bbox2: List[int]) -> float:
-        """Calculate distance between centers of two bounding boxes"""
-        try:
-            x1, y1, w1, h1 = bbox1
-            x2, y2, w2, h2 = bbox2
-            
-            # Calculate centers
-            center1_x = x1 + w1 / 2
-            center1_y = y1 + h1 / 2
-            center2_x = x2 + w2 / 2
-            center2_y = y2 + h2 / 2
-            
-            # Euclidean distance
-            distance = np.sqrt((center2_x - center1_x) ** 2 + (center2_y - center1_y) ** 2)
-            
-            return float(distance)
-            
-        except Exception as e:
-            logger.error(f"❌ Distance calculation error: {e}")
-            return float('inf')
-    
     def _calculate_element_confidence(self, element: Dict) -> float:
         """Calculate confidence score for enhanced element"""
         try:
@@ -495,7 +788,7 @@ class VisualFormAnalyzer:
                 confidence += min(0.3, text_regions * 0.03)
             
             # Factor in form structure
-            if visual_features.get('lines'):
+            if len(visual_features.get('lines', ())) > 0:
                 confidence += 0.2
             
             # Base confidence for having visual features
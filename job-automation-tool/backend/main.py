@@ -1,15 +1,27 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Form, Response
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from datetime import datetime
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import multiprocessing
+import threading
+import functools
 import uvicorn
 import os
 import uuid
+from urllib.parse import quote
 from loguru import logger
-import PyPDF2
-import io
-from typing import Optional
+import aiofiles
+import aiofiles.os
+import aiofiles.tempfile
+import orjson
+from typing import Optional, Tuple
 
 from app.models import (
     JobCreate, JobResponse, AutomationStatus, ScrapingRequest, FormDataRequest, FormActivityLog,
@@ -23,6 +35,8 @@ from app.services.job_scraper import JobScraperService
 from app.services.form_filler_service import FormFillerService
 from app.services.resume_parser_service import ResumeParserService
 from app.services.resume_storage_service import ResumeStorageService
+from app.services.response_cache import ResponseCache
+from app.services.pdf_text import parse_pdf_pages
 from app.core.config import settings
 
 # Global managers
@@ -33,28 +47,147 @@ scraper_service = None
 form_filler_service = None
 resume_parser_service = None
 resume_storage_service = None
+response_cache = None
+
+# PDF parsing is CPU-bound; worker processes keep it off the event loop and out of the GIL.
+# The pool is created in lifespan with forkserver workers: forking this process would copy its
+# running threads' locks and the loaded spaCy model into every worker
+PDF_POOL_WORKERS = min(4, os.cpu_count() or 1)
+_pdf_pool = None
+
+# PDFs longer than this many pages have the remaining pages split across PDF_PAGE_WORKERS workers
+PDF_PARALLEL_MIN_PAGES = 8
+PDF_PAGE_WORKERS = 4
+
+# Fields analyzed concurrently (shared across requests to protect the detector backend)
+FIELD_ANALYSIS_CONCURRENCY = 16
+_field_analysis_semaphore = asyncio.Semaphore(FIELD_ANALYSIS_CONCURRENCY)
+
+# Distinct (field, page context) signatures whose detection results are memoized.
+# Keyed by hash so the fields' surrounding/parent/sibling text is not retained by the cache
+FIELD_DETECTION_CACHE_SIZE = 4096
+_field_detection_cache: OrderedDict = OrderedDict()  # signature hash -> (category, field_type, confidence)
+_field_detection_lock = threading.Lock()
+
+def detect_field_type_cached(field_dict: dict, context: dict) -> Tuple[str, str, float]:
+    """Field detection through the signature cache (identical ATS fields recur across pages and users)"""
+    detector = form_filler_service.smart_field_detector
+    # nlp readiness is part of the key so results computed before spaCy warmed up are kept apart
+    key = hash((tuple(sorted(field_dict.items())), tuple(sorted(context.items())), detector.nlp is not None))
+    
+    with _field_detection_lock:
+        result = _field_detection_cache.get(key)
+        if result is not None:
+            _field_detection_cache.move_to_end(key)
+            return result
+    
+    result = detector.detect_field_type(field_dict, context)
+    with _field_detection_lock:
+        _field_detection_cache[key] = result
+        if len(_field_detection_cache) > FIELD_DETECTION_CACHE_SIZE:
+            _field_detection_cache.popitem(last=False)
+    return result
+
+# Seconds a cached dashboard read may be served before it is recomputed
+READ_CACHE_TTL = 5
+
+def cached(key: str, ttl: int = READ_CACHE_TTL):
+    """Serve a read endpoint from the response cache; `key` is formatted with the path params"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            cache_key = key.format(**kwargs)
+            hit = await response_cache.get(cache_key)
+            if hit is not None:
+                return hit
+            
+            result = jsonable_encoder(await handler(*args, **kwargs))
+            await response_cache.set(cache_key, result, ttl)
+            return result
+        return wrapper
+    return decorator
+
+def catch_errors(action: str):
+    """Log unexpected handler errors as "Error <action>" and return a 500; HTTPExceptions pass through"""
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await handler(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                logger.error(f"Error {action}: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+        return wrapper
+    return decorator
+
+def resume_json_response(resume: ResumeRecord) -> Response:
+    """Return {"success": true, "resume": ...} with the resume serialized once, by pydantic"""
+    # Fragment embeds the pre-serialized JSON as-is instead of dumping a dict copy of the model
+    content = orjson.dumps({"success": True, "resume": orjson.Fragment(resume.model_dump_json())})
+    return Response(content=content, media_type="application/json")
+
+# Uploads are copied to disk in chunks of this size instead of being read into memory whole
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Resume content types accepted by upload_resume (allow text files for testing)
+_ALLOWED_TYPES = frozenset({
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text/plain",
+})
+
+# Response timestamps have one-second resolution; a background ticker refreshes this string
+TIMESTAMP_TICK_SECONDS = 1
+_now_iso = datetime.now().isoformat(timespec="seconds")
+
+async def _timestamp_ticker():
+    """Refresh the cached response timestamp once per tick"""
+    global _now_iso
+    while True:
+        _now_iso = datetime.now().isoformat(timespec="seconds")
+        await asyncio.sleep(TIMESTAMP_TICK_SECONDS)
+
+# Responses smaller than this aren't worth compressing; level 5 favours speed over ratio
+GZIP_MINIMUM_SIZE = 1024
+GZIP_COMPRESS_LEVEL = 5
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    global db_manager, queue_manager, automation_manager, scraper_service, form_filler_service, resume_parser_service, resume_storage_service
+    global db_manager, queue_manager, automation_manager, scraper_service, form_filler_service, resume_parser_service, resume_storage_service, response_cache, _pdf_pool
     
     logger.info("Starting Job Automation API server...")
     
+    timestamp_ticker = asyncio.create_task(_timestamp_ticker())
+    _pdf_pool = ProcessPoolExecutor(
+        max_workers=PDF_POOL_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver")
+    )
+    
     db_manager = DatabaseManager()
-    await db_manager.initialize()
+    queue_manager = JobQueueManager(settings.redis_url, settings.use_redis)
+    resume_storage_service = ResumeStorageService()
+    response_cache = ResponseCache(settings.redis_url, settings.use_redis)
+    
+    async def initialize_job_store():
+        # The queue reloads pending jobs from Postgres, so it waits for the database
+        await db_manager.initialize()
+        await queue_manager.initialize(db_manager)
     
-    queue_manager = JobQueueManager()
-    await queue_manager.initialize(db_manager)
+    # Postgres, the resume store and the cache are independent; connect to them concurrently
+    await asyncio.gather(
+        initialize_job_store(),
+        resume_storage_service.initialize_database(),
+        response_cache.initialize()
+    )
     
     automation_manager = AutomationManager(db_manager, queue_manager)
     scraper_service = JobScraperService(db_manager, queue_manager)
     form_filler_service = FormFillerService(db_manager)
-    
-    # Initialize resume services
     resume_parser_service = ResumeParserService()
-    resume_storage_service = ResumeStorageService()
-    await resume_storage_service.initialize_database()
     
     logger.info("✅ All services initialized successfully")
     
@@ -62,20 +195,31 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down services...")
+    timestamp_ticker.cancel()
     if automation_manager:
         await automation_manager.cleanup()
     if scraper_service:
         await scraper_service.cleanup()
     if form_filler_service:
         await form_filler_service.cleanup()
+    if db_manager:
+        await db_manager.cleanup()
+    if response_cache:
+        await response_cache.cleanup()
+    if _pdf_pool:
+        _pdf_pool.shutdown(wait=False, cancel_futures=True)
 
 app = FastAPI(
     title="Job Automation Tool",
     description="Automated job application system with local LLM integration",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+# Compress JSON bodies above GZIP_MINIMUM_SIZE bytes (added first so CORS wraps the compressed response)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=GZIP_COMPRESS_LEVEL)
+
 # CORS middleware for React frontend and browser extension
 app.add_middleware(
     CORSMiddleware,
@@ -83,299 +227,259 @@ app.add_middleware(
     allow_credentials=False,  # Disable credentials for simpler CORS
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["Content-Disposition"],  # lets the extension read the resume filename
 )
 
 @app.get("/api/status")
+@catch_errors("getting status")
+@cached("status")
 async def get_status():
     """Get current automation status and statistics"""
-    try:
-        stats = await db_manager.get_application_stats()
-        queue_jobs = await queue_manager.get_all_jobs()
-        
-        return {
-            "running": automation_manager.is_running if automation_manager else False,
-            "stats": stats,
-            "queue": queue_jobs
-        }
-    except Exception as e:
-        logger.error(f"Error getting status: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    stats = await db_manager.get_application_stats()
+    queue_jobs = await queue_manager.get_all_jobs()
+    
+    return {
+        "running": automation_manager.is_running if automation_manager else False,
+        "stats": stats,
+        "queue": queue_jobs
+    }
 
 @app.post("/api/start")
+@catch_errors("starting automation")
 async def start_automation(background_tasks: BackgroundTasks):
     """Start the job automation process"""
-    try:
-        if automation_manager.is_running:
-            return {"success": False, "message": "Automation already running"}
-        
-        background_tasks.add_task(automation_manager.start)
-        logger.info("🚀 Automation started")
-        
-        return {"success": True, "message": "Automation started"}
-    except Exception as e:
-        logger.error(f"Error starting automation: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if automation_manager.is_running:
+        return {"success": False, "message": "Automation already running"}
+    
+    background_tasks.add_task(automation_manager.start)
+    await response_cache.invalidate("status")
+    logger.info("🚀 Automation started")
+    
+    return {"success": True, "message": "Automation started"}
 
 @app.post("/api/stop")
+@catch_errors("stopping automation")
 async def stop_automation():
     """Stop the job automation process"""
-    try:
-        await automation_manager.stop()
-        logger.info("⏹️ Automation stopped")
-        
-        return {"success": True, "message": "Automation stopped"}
-    except Exception as e:
-        logger.error(f"Error stopping automation: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await automation_manager.stop()
+    await response_cache.invalidate("status")
+    logger.info("⏹️ Automation stopped")
+    
+    return {"success": True, "message": "Automation stopped"}
 
 @app.post("/api/scrape")
+@catch_errors("starting scrape")
 async def scrape_jobs(request: ScrapingRequest, background_tasks: BackgroundTasks):
     """Scrape jobs from various platforms"""
-    try:
-        logger.info("🔍 Starting job scraping...")
-        
-        # Add scraping task to background
-        background_tasks.add_task(
-            scraper_service.scrape_jobs,
-            request.search_terms,
-            request.locations
-        )
-        
-        return {
-            "success": True,
-            "message": "Job scraping started",
-            "status": "processing"
-        }
-    except Exception as e:
-        logger.error(f"Error starting scrape: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    logger.info("🔍 Starting job scraping...")
+    
+    # Add scraping task to background
+    background_tasks.add_task(
+        scraper_service.scrape_jobs,
+        request.search_terms,
+        request.locations
+    )
+    
+    return {
+        "success": True,
+        "message": "Job scraping started",
+        "status": "processing"
+    }
 
 @app.post("/api/add-sample-jobs")
+@catch_errors("adding sample jobs")
 async def add_sample_jobs():
     """Add sample jobs for testing"""
-    try:
-        sample_jobs = [
-            {
-                "title": "Software Engineer",
-                "company": "Stripe",
-                "platform": "linkedin",
-                "description": "Build scalable web applications using React and Node.js",
-                "requirements": "JavaScript, React, Node.js, 2+ years experience",
-                "location": "Remote",
-                "url": "https://stripe.com/jobs/listing/software-engineer"
-            },
-            {
-                "title": "Data Engineer", 
-                "company": "Airbnb",
-                "platform": "indeed",
-                "description": "Design and maintain data pipelines for analytics",
-                "requirements": "Python, SQL, AWS, ETL experience",
-                "location": "San Francisco",
-                "url": "https://careers.airbnb.com/positions/data-engineer"
-            },
-            {
-                "title": "Full Stack Developer",
-                "company": "Notion",
-                "platform": "linkedin",
-                "description": "Join our growing team to build innovative products",
-                "requirements": "JavaScript, Python, React, PostgreSQL",
-                "location": "Remote",
-                "url": "https://www.notion.so/careers/full-stack-engineer"
-            }
-        ]
-        
-        added_count = 0
-        for job_data in sample_jobs:
-            job_id = await queue_manager.add_job(job_data)
-            await db_manager.add_job(job_id, job_data)
-            added_count += 1
-            logger.info(f"📋 Added sample job: {job_data['title']} at {job_data['company']}")
-        
-        logger.info(f"✅ Added {added_count} sample jobs")
-        
-        return {
-            "success": True, 
-            "message": f"Added {added_count} sample jobs",
-            "jobs_added": added_count
+    sample_jobs = [
+        {
+            "title": "Software Engineer",
+            "company": "Stripe",
+            "platform": "linkedin",
+            "description": "Build scalable web applications using React and Node.js",
+            "requirements": "JavaScript, React, Node.js, 2+ years experience",
+            "location": "Remote",
+            "url": "https://stripe.com/jobs/listing/software-engineer"
+        },
+        {
+            "title": "Data Engineer", 
+            "company": "Airbnb",
+            "platform": "indeed",
+            "description": "Design and maintain data pipelines for analytics",
+            "requirements": "Python, SQL, AWS, ETL experience",
+            "location": "San Francisco",
+            "url": "https://careers.airbnb.com/positions/data-engineer"
+        },
+        {
+            "title": "Full Stack Developer",
+            "company": "Notion",
+            "platform": "linkedin",
+            "description": "Join our growing team to build innovative products",
+            "requirements": "JavaScript, Python, React, PostgreSQL",
+            "location": "Remote",
+            "url": "https://www.notion.so/careers/full-stack-engineer"
         }
-    except Exception as e:
-        logger.error(f"Error adding sample jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    ]
+    
+    # One batched insert, then one queue update; only jobs stored in the database get queued
+    jobs = [{"id": str(uuid.uuid4()), **job} for job in sample_jobs]
+    stored_ids = set(await db_manager.add_jobs_bulk([(job["id"], job) for job in jobs]))
+    jobs = [job for job in jobs if job["id"] in stored_ids]
+    await queue_manager.add_jobs(jobs)
+    added_count = len(jobs)
+    
+    await response_cache.invalidate("status", "jobs")
+    logger.info(f"✅ Added {added_count} sample jobs")
+    
+    return {
+        "success": True, 
+        "message": f"Added {added_count} sample jobs",
+        "jobs_added": added_count
+    }
 
 @app.get("/api/jobs")
+@catch_errors("getting jobs")
+@cached("jobs")
 async def get_jobs():
     """Get all jobs in the system"""
-    try:
-        jobs = await db_manager.get_all_jobs()
-        return {"jobs": jobs}
-    except Exception as e:
-        logger.error(f"Error getting jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    jobs = await db_manager.get_all_jobs()
+    return {"jobs": jobs}
 
 @app.delete("/api/jobs/{job_id}")
+@catch_errors("deleting job")
 async def delete_job(job_id: str):
     """Delete a specific job"""
-    try:
-        await db_manager.delete_job(job_id)
-        await queue_manager.remove_job(job_id)
-        
-        logger.info(f"🗑️ Deleted job: {job_id}")
-        return {"success": True, "message": "Job deleted"}
-    except Exception as e:
-        logger.error(f"Error deleting job: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await db_manager.delete_job(job_id)
+    await queue_manager.remove_job(job_id)
+    await response_cache.invalidate("status", "jobs")
+    
+    logger.info(f"🗑️ Deleted job: {job_id}")
+    return {"success": True, "message": "Job deleted"}
 
 @app.post("/api/clear-jobs")
+@catch_errors("clearing jobs")
 async def clear_all_jobs():
     """Clear all jobs from database and queue"""
-    try:
-        await queue_manager.clear_queue()
-        
-        # Clear database
-        async with db_manager.connection.execute("DELETE FROM jobs") as cursor:
-            pass
-        await db_manager.connection.commit()
-        
-        logger.info("🧹 All jobs cleared")
-        return {"success": True, "message": "All jobs cleared"}
-    except Exception as e:
-        logger.error(f"Error clearing jobs: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await queue_manager.clear_queue()
+    
+    # Clear database
+    await db_manager.clear_jobs()
+    await response_cache.invalidate("status", "jobs")
+    
+    logger.info("🧹 All jobs cleared")
+    return {"success": True, "message": "All jobs cleared"}
 
 # Browser Extension API Endpoints
 @app.get("/api/health")
 async def health_check():
     """Health check for browser extension"""
-    return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+    return {"status": "healthy", "timestamp": _now_iso}
 
 @app.post("/api/generate-form-data")
+@catch_errors("generating form data")
 async def generate_form_data(request: FormDataRequest):
     """Generate intelligent form data for browser extension with AI field detection"""
-    try:
-        form_data = await form_filler_service.generate_form_data(request)
-        logger.info(f"📝 Generated form data for {request.url}")
-        return form_data
-    except Exception as e:
-        logger.error(f"Error generating form data: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    form_data = await form_filler_service.generate_form_data(request)
+    logger.info(f"📝 Generated form data for {request.url}")
+    return form_data
 
 @app.post("/api/analyze-form")
+@catch_errors("analyzing form")
 async def analyze_form(request: FormAnalysisRequest):
     """Analyze form fields using AI without generating form data"""
-    try:
-        # Run analysis only
-        context = {
-            'page_title': request.page_title or '',
-            'page_url': request.url,
-            'form_purpose': request.form_purpose or ''
-        }
-        
-        analysis_results = []
-        for field in request.form_fields:
-            field_dict = field.dict()
-            category, field_type, confidence = form_filler_service.smart_field_detector.detect_field_type(field_dict, context)
-            
-            analysis_results.append({
-                'field_id': field.id,
-                'field_name': field.name,
-                'detected_category': category,
-                'detected_type': field_type,
-                'confidence': confidence
-            })
+    # Run analysis only
+    context = {
+        'page_title': request.page_title or '',
+        'page_url': request.url,
+        'form_purpose': request.form_purpose or ''
+    }
+    
+    async def analyze_field(field: FormFieldInfo) -> dict:
+        # Detection is synchronous CPU work; run it off the event loop, capped by the semaphore
+        async with _field_analysis_semaphore:
+            category, field_type, confidence = await asyncio.to_thread(
+                detect_field_type_cached, field.dict(), context
+            )
         
-        logger.info(f"🔍 Analyzed {len(request.form_fields)} form fields")
         return {
-            'url': request.url,
-            'fields_analyzed': len(request.form_fields),
-            'analysis_results': analysis_results,
-            'timestamp': datetime.now().isoformat()
+            'field_id': field.id,
+            'field_name': field.name,
+            'detected_category': category,
+            'detected_type': field_type,
+            'confidence': confidence
         }
-    except Exception as e:
-        logger.error(f"Error analyzing form: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    
+    analysis_results = await asyncio.gather(*(analyze_field(field) for field in request.form_fields))
+    
+    logger.info(f"🔍 Analyzed {len(request.form_fields)} form fields")
+    return {
+        'url': request.url,
+        'fields_analyzed': len(request.form_fields),
+        'analysis_results': analysis_results,
+        'timestamp': _now_iso
+    }
 
 @app.post("/api/log-form-activity")
+@catch_errors("logging form activity")
 async def log_form_activity(activity: FormActivityLog):
     """Log form filling activity for learning"""
-    try:
-        await form_filler_service.log_form_activity(activity)
-        return {"success": True, "message": "Activity logged"}
-    except Exception as e:
-        logger.error(f"Error logging form activity: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await form_filler_service.log_form_activity(activity)
+    return {"success": True, "message": "Activity logged"}
 
 @app.get("/api/user-stats")
+@catch_errors("getting user stats")
 async def get_user_stats():
     """Get user statistics for browser extension"""
-    try:
-        stats = await form_filler_service.get_user_stats()
-        return stats
-    except Exception as e:
-        logger.error(f"Error getting user stats: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    stats = await form_filler_service.get_user_stats()
+    return stats
 
 @app.get("/api/learning-insights/{domain}")
+@catch_errors("getting learning insights")
 async def get_learning_insights(domain: str):
     """Get learning insights for specific domain"""
-    try:
-        insights = await form_filler_service.get_learning_insights(domain)
-        return insights
-    except Exception as e:
-        logger.error(f"Error getting learning insights: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    insights = await form_filler_service.get_learning_insights(domain)
+    return insights
 
 @app.post("/api/submit-user-response")
+@catch_errors("storing user response")
 async def submit_user_response(request: UserResponseRequest):
     """Submit user response for missing form field information"""
-    try:
-        await form_filler_service.store_user_response(
-            request.resume_id,
-            request.field_key, 
-            request.question,
-            request.response
-        )
-        
-        return {
-            "success": True,
-            "message": "User response stored successfully",
-            "field_key": request.field_key
-        }
-    except Exception as e:
-        logger.error(f"Error storing user response: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    await form_filler_service.store_user_response(
+        request.resume_id,
+        request.field_key, 
+        request.question,
+        request.response
+    )
+    
+    return {
+        "success": True,
+        "message": "User response stored successfully",
+        "field_key": request.field_key
+    }
 
 # Resume API Endpoints
 @app.post("/api/resumes/upload")
+@catch_errors("uploading resume")
 async def upload_resume(file: UploadFile = File(...)):
     """Upload and parse a resume file"""
+    # Validate file type
+    if file.content_type not in _ALLOWED_TYPES:
+        raise HTTPException(
+            status_code=400, 
+            detail="Only PDF, DOC, DOCX, and TXT files are allowed"
+        )
+    
+    # Stream the upload to disk; parsing and storage both work from the file
+    temp_path, file_size = await stream_upload_to_disk(file, resume_storage_service.uploads_dir)
     try:
-        # Validate file type (allow text files for testing)
-        allowed_types = ["application/pdf", "application/msword", 
-                        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                        "text/plain"]
-        
-        if file.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400, 
-                detail="Only PDF, DOC, DOCX, and TXT files are allowed"
-            )
-        
-        # Read file content
-        file_content = await file.read()
-        file_size = len(file_content)
-        
         # Extract text based on file type
-        resume_text = ""
-        if file.content_type == "application/pdf":
-            resume_text = extract_pdf_text(file_content)
-        elif file.content_type == "text/plain":
-            resume_text = file_content.decode('utf-8')
-        else:
+        extractor = _EXTRACTORS.get(file.content_type)
+        if extractor is None:
             # For DOC/DOCX, we'll need additional libraries
             raise HTTPException(
                 status_code=400,
                 detail="DOC/DOCX support coming soon. Please use PDF files."
             )
+        resume_text = await extractor(temp_path)
         
         # Parse resume with LLM
         parsed_data = await resume_parser_service.parse_resume_text(resume_text)
@@ -393,151 +497,180 @@ async def upload_resume(file: UploadFile = File(...)):
             content_type=file.content_type
         )
         
-        # Save to storage
-        await resume_storage_service.save_resume(resume_record, file_content)
-        
-        logger.info(f"📄 Successfully uploaded and parsed resume: {file.filename}")
-        
-        return {
-            "success": True,
-            "message": "Resume uploaded and parsed successfully",
-            "resume_id": resume_id,
-            "parsed_summary": await resume_parser_service.extract_resume_summary(parsed_data)
-        }
-        
-    except Exception as e:
-        logger.error(f"Error uploading resume: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+        # Save to storage (moves the streamed file into place)
+        await resume_storage_service.save_resume_from_file(resume_record, temp_path)
+        await response_cache.invalidate("resumes")
+    finally:
+        if await aiofiles.os.path.exists(temp_path):
+            await aiofiles.os.remove(temp_path)
+    
+    logger.info(f"📄 Successfully uploaded and parsed resume: {file.filename}")
+    
+    return {
+        "success": True,
+        "message": "Resume uploaded and parsed successfully",
+        "resume_id": resume_id,
+        "parsed_summary": await resume_parser_service.extract_resume_summary(parsed_data)
+    }
 
 @app.get("/api/resumes", response_model=ResumeListResponse)
+@catch_errors("getting resumes")
+@cached("resumes")
 async def get_all_resumes():
     """Get list of all uploaded resumes"""
-    try:
-        resumes = await resume_storage_service.get_all_resumes()
-        return resumes
-    except Exception as e:
-        logger.error(f"Error getting resumes: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    resumes = await resume_storage_service.get_all_resumes()
+    return resumes
 
 @app.get("/api/resumes/{resume_id}")
+@catch_errors("getting resume")
 async def get_resume(resume_id: str):
     """Get detailed resume data by ID"""
-    try:
-        resume = await resume_storage_service.get_resume_by_id(resume_id)
-        if not resume:
-            raise HTTPException(status_code=404, detail="Resume not found")
-        
-        return {
-            "success": True,
-            "resume": resume.model_dump()
-        }
-    except Exception as e:
-        logger.error(f"Error getting resume: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    resume = await resume_storage_service.get_resume_by_id(resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    return resume_json_response(resume)
 
 @app.post("/api/resumes/set-active")
+@catch_errors("setting active resume")
 async def set_active_resume(request: SetActiveResumeRequest):
     """Set a resume as the active one for form filling"""
-    try:
-        success = await resume_storage_service.set_active_resume(request.resume_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Resume not found")
-        
-        logger.info(f"✅ Set resume {request.resume_id} as active")
-        return {"success": True, "message": "Active resume updated"}
-        
-    except Exception as e:
-        logger.error(f"Error setting active resume: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = await resume_storage_service.set_active_resume(request.resume_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    await response_cache.invalidate("resumes")
+    
+    logger.info(f"✅ Set resume {request.resume_id} as active")
+    return {"success": True, "message": "Active resume updated"}
 
 @app.get("/api/resumes/active")
+@catch_errors("getting active resume")
 async def get_active_resume():
     """Get the currently active resume"""
-    try:
-        active_resume = await resume_storage_service.get_active_resume()
-        if not active_resume:
-            return {"success": False, "message": "No active resume found"}
-        
-        return {
-            "success": True,
-            "resume": active_resume.model_dump()
-        }
-    except Exception as e:
-        logger.error(f"Error getting active resume: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    active_resume = await resume_storage_service.get_active_resume()
+    if not active_resume:
+        return {"success": False, "message": "No active resume found"}
+    
+    return resume_json_response(active_resume)
 
 @app.delete("/api/resumes/{resume_id}")
+@catch_errors("deleting resume")
 async def delete_resume(resume_id: str):
     """Delete a resume"""
-    try:
-        success = await resume_storage_service.delete_resume(resume_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Resume not found")
-        
-        logger.info(f"🗑️ Deleted resume: {resume_id}")
-        return {"success": True, "message": "Resume deleted"}
-        
-    except Exception as e:
-        logger.error(f"Error deleting resume: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    success = await resume_storage_service.delete_resume(resume_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    await response_cache.invalidate("resumes")
+    
+    logger.info(f"🗑️ Deleted resume: {resume_id}")
+    return {"success": True, "message": "Resume deleted"}
 
 @app.get("/api/resumes/{resume_id}/file")
+@catch_errors("getting resume file")
 async def get_resume_file(resume_id: str):
-    """Get resume file content for upload"""
-    try:
-        # Validate resume_id format
-        if not resume_id or len(resume_id) > 100 or len(resume_id) < 10:
-            logger.error(f"Invalid resume ID format: {resume_id[:100]}...")
-            raise HTTPException(status_code=400, detail="Invalid resume ID format")
-        
-        resume = await resume_storage_service.get_resume_by_id(resume_id)
-        if not resume:
-            logger.error(f"Resume not found for ID: {resume_id}")
-            raise HTTPException(status_code=404, detail="Resume not found")
-        
-        file_content = await resume_storage_service.get_resume_file_content(resume_id)
-        if not file_content:
-            raise HTTPException(status_code=404, detail="Resume file not found")
-        
-        # Return file info for browser extension
-        import base64
-        file_data = base64.b64encode(file_content).decode('utf-8')
-        
-        return {
-            "success": True,
-            "file_data": file_data,
-            "filename": resume.original_filename,
-            "content_type": resume.content_type,
-            "file_size": resume.file_size
+    """Stream the resume file for upload"""
+    # Validate resume_id format
+    if not resume_id or len(resume_id) > 100 or len(resume_id) < 10:
+        logger.error(f"Invalid resume ID format: {resume_id[:100]}...")
+        raise HTTPException(status_code=400, detail="Invalid resume ID format")
+    
+    resume = await resume_storage_service.get_resume_by_id(resume_id)
+    if not resume:
+        logger.error(f"Resume not found for ID: {resume_id}")
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    file_stream = resume_storage_service.open_resume_stream(resume)
+    if file_stream is None:
+        raise HTTPException(status_code=404, detail="Resume file not found")
+    
+    # Stream raw bytes to the browser extension (no base64/JSON re-encoding)
+    return StreamingResponse(
+        file_stream,
+        media_type=resume.content_type,
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(resume.original_filename)}",
+            "Content-Length": str(resume.file_size)
         }
-        
-    except Exception as e:
-        logger.error(f"Error getting resume file: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    )
 
-def extract_pdf_text(file_content: bytes) -> str:
-    """Extract text from PDF file content"""
+async def stream_upload_to_disk(file: UploadFile, directory: str) -> Tuple[str, int]:
+    """Copy an upload to a temporary file in chunks, returning its path and size"""
+    file_size = 0
+    tmp = await aiofiles.tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.part', delete=False)
     try:
-        pdf_file = io.BytesIO(file_content)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        
-        return text.strip()
+        try:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                await tmp.write(chunk)
+                file_size += len(chunk)
+        finally:
+            await tmp.close()
+    except BaseException:
+        # Client disconnects (cancellation) and full disks must not leave a partial .part file behind
+        await aiofiles.os.remove(tmp.name)
+        raise
+    
+    return tmp.name, file_size
+
+async def extract_pdf_text(file_path: str) -> str:
+    """Extract text from a PDF file"""
+    try:
+        loop = asyncio.get_running_loop()
+        page_count, text = await loop.run_in_executor(_pdf_pool, parse_pdf_pages, file_path, 0, PDF_PARALLEL_MIN_PAGES)
+        parts = [text]
+        
+        # MuPDF documents can't be shared across threads, so long PDFs are split
+        # into page ranges that each worker process opens on its own
+        if page_count > PDF_PARALLEL_MIN_PAGES:
+            step = -(-(page_count - PDF_PARALLEL_MIN_PAGES) // PDF_PAGE_WORKERS)
+            results = await asyncio.gather(*(
+                loop.run_in_executor(_pdf_pool, parse_pdf_pages, file_path, start, start + step)
+                for start in range(PDF_PARALLEL_MIN_PAGES, page_count, step)
+            ))
+            parts.extend(page_text for _, page_text in results)
+        
+        return "\n".join(parts).strip()
     except Exception as e:
         logger.error(f"Error extracting PDF text: {e}")
         raise HTTPException(status_code=400, detail="Could not extract text from PDF")
 
-# Serve React static files
-app.mount("/", StaticFiles(directory="../public", html=True), name="static")
+async def extract_plain_text(file_path: str) -> str:
+    """Read a UTF-8 text file"""
+    async with aiofiles.open(file_path, 'rb') as f:
+        return (await f.read()).decode('utf-8')
+
+# Text extractor per uploaded content type
+_EXTRACTORS = {
+    "application/pdf": extract_pdf_text,
+    "text/plain": extract_plain_text,
+}
+
+# Vite emits content-hashed bundles under assets/, so they never change at a given URL
+STATIC_ASSET_PREFIX = "assets" + os.sep
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers keep hashed assets and revalidate index.html"""
+    
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            if path.startswith(STATIC_ASSET_PREFIX):
+                response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+            else:
+                response.headers["Cache-Control"] = "no-cache"
+        return response
+
+# Serve React static files (mounted last so the catch-all "/" doesn't shadow the API routes)
+app.mount("/", CachedStaticFiles(directory="../public", html=True), name="static")
 
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=settings.port,
+        loop="uvloop",  # libuv event loop and C HTTP parser, both shipped with uvicorn[standard]
+        http="httptools",
         reload=settings.debug,
+        workers=settings.workers,
         log_level="info"
     )
\ No newline at end of file
@@ -10,22 +10,25 @@ from app.core.config import settings
 async def test_postgres_connection():
     """Test PostgreSQL connection"""
     try:
-        # Test basic connection
+        # Test basic connection through a pool, as the application connects
         logger.info("Testing PostgreSQL connection...")
         
-        connection = await asyncpg.connect(
+        pool = await asyncpg.create_pool(
             host=settings.database_host,
             port=settings.database_port,
             database=settings.database_name,
             user=settings.database_user,
-            password=settings.database_password
+            password=settings.database_password,
+            min_size=1,
+            max_size=2
         )
         
         # Test basic query
-        result = await connection.fetchval("SELECT version()")
+        async with pool.acquire() as connection:
+            result = await connection.fetchval("SELECT version()")
         logger.info(f"✅ PostgreSQL version: {result}")
         
-        await connection.close()
+        await pool.close()
         logger.info("✅ Database connection test successful")
         
     except Exception as e:
@@ -0,0 +1,80 @@
+"""
+Tests for DatabaseManager.add_jobs_bulk against an in-memory stand-in for the asyncpg pool
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+pytest.importorskip("pydantic_settings")
+
+from app.services.database import DatabaseManager
+
+class FakeConnection:
+    """Stores job rows by id and rejects duplicate ids like the jobs primary key"""
+    def __init__(self, existing_ids=()):
+        self.rows = {job_id: None for job_id in existing_ids}
+        self.executemany_calls = 0
+
+    def _insert(self, row):
+        if row[0] in self.rows:
+            raise asyncpg.exceptions.UniqueViolationError(f"duplicate key value: {row[0]}")
+        self.rows[row[0]] = row
+
+    @asynccontextmanager
+    async def transaction(self):
+        snapshot = dict(self.rows)
+        try:
+            yield
+        except BaseException:
+            self.rows = snapshot
+            raise
+
+    async def executemany(self, query, rows):
+        self.executemany_calls += 1
+        for row in rows:
+            self._insert(row)
+
+    async def execute(self, query, *row):
+        self._insert(row)
+        return "INSERT 0 1"
+
+class FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.connection
+
+def make_manager(connection: FakeConnection) -> DatabaseManager:
+    manager = DatabaseManager()
+    manager.pool_rw = FakePool(connection)
+    return manager
+
+def job(title: str = "Engineer", **overrides) -> dict:
+    data = {"title": title, "company": "Acme", "platform": "linkedin", "url": "https://example.com/job"}
+    data.update(overrides)
+    return data
+
+def test_bulk_insert_stores_whole_batch_in_one_call():
+    connection = FakeConnection()
+    stored = asyncio.run(make_manager(connection).add_jobs_bulk([("a", job()), ("b", job())]))
+
+    assert stored == ["a", "b"]
+    assert connection.executemany_calls == 1
+
+def test_bad_job_in_batch_does_not_drop_the_good_ones():
+    connection = FakeConnection(existing_ids=["dup"])
+    jobs = [
+        ("good", job()),
+        ("no-title", job(title="")),
+        ("dup", job()),
+        ("long", job(company="x" * 1000)),
+    ]
+    stored = asyncio.run(make_manager(connection).add_jobs_bulk(jobs))
+
+    assert stored == ["good", "long"]
+    assert len(connection.rows["long"][2]) == 255
+    assert "no-title" not in connection.rows
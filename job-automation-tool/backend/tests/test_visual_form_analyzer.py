@@ -0,0 +1,88 @@
+"""
+Regression tests for VisualFormAnalyzer input-field detection on synthetic form screenshots
+"""
+import asyncio
+import base64
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+pytest.importorskip("pytesseract")
+
+from app.services.visual_form_analyzer import VisualFormAnalyzer
+
+FIELD_COUNT = 8
+
+def render_form(width: int = 1920, height: int = 1080, border: int = 1, outline: str = None) -> np.ndarray:
+    """White page with labelled input boxes drawn with a thin grey border, optionally inside an outline"""
+    image = np.full((height, width, 3), 255, np.uint8)
+    if outline == 'open':
+        # Left and bottom rules joined into one L-shaped blob whose bbox covers the whole form
+        cv2.line(image, (60, 40), (60, 1040), (90, 90, 90), 2)
+        cv2.line(image, (60, 1040), (1300, 1040), (90, 90, 90), 2)
+    elif outline == 'closed':
+        cv2.rectangle(image, (60, 40), (1300, 1040), (90, 90, 90), 2)
+    elif outline == 'text':
+        for k in range(40):
+            cv2.putText(image, "lorem ipsum dolor sit amet", (1350, 60 + k * 24),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
+    for i in range(FIELD_COUNT):
+        y = 100 + i * 115
+        cv2.putText(image, f"Field {i} name:", (100, y), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 0, 0), 2)
+        cv2.rectangle(image, (400, y - 30), (900, y + 10), (120, 120, 120), border)
+    return image
+
+def dom_elements() -> list:
+    """DOM boxes of the rendered inputs, as the browser extension reports them"""
+    return [{'id': f'f{i}', 'bbox': [400, 100 + i * 115 - 30, 500, 40]} for i in range(FIELD_COUNT)]
+
+def analyze(image: np.ndarray) -> dict:
+    """Run the full screenshot analysis with OCR stubbed out (tesseract isn't needed for shapes)"""
+    analyzer = VisualFormAnalyzer()
+    analyzer._perform_ocr = lambda _image: {'text_elements': [], 'field_labels': []}
+    _, png = cv2.imencode('.png', image)
+    screenshot = base64.b64encode(png.tobytes()).decode()
+    result = asyncio.run(analyzer.analyze_form_screenshot(screenshot, dom_elements()))
+    assert result['success'], result.get('error')
+    return result
+
+def baseline_fields(image: np.ndarray) -> list:
+    """Input boxes found by the original per-contour pass (RETR_EXTERNAL on the full-resolution edges)"""
+    edges = cv2.Canny(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), 50, 150, apertureSize=3)
+    contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    fields = []
+    for contour in contours:
+        approx = cv2.approxPolyDP(contour, 0.02 * cv2.arcLength(contour, True), True)
+        if len(approx) == 4:
+            x, y, w, h = cv2.boundingRect(contour)
+            if w > 50 and h > 15 and w < 800 and h < 100:
+                fields.append([x, y, w, h])
+    return sorted(fields)
+
+def matched_count(result: dict) -> int:
+    return sum(1 for element in result['enhanced_elements'] if element.get('visual_features'))
+
+def test_1080p_two_pixel_borders_detects_every_field():
+    result = analyze(render_form(1920, 1080, border=2))
+    assert len(result['visual_features']['potential_fields']) == FIELD_COUNT
+    assert matched_count(result) == FIELD_COUNT
+
+@pytest.mark.parametrize("size", [(1920, 1080), (2560, 1440), (3840, 2160)])
+@pytest.mark.parametrize("border", [1, 2])
+def test_thin_borders_match_every_dom_field(size, border):
+    result = analyze(render_form(*size, border=border))
+    assert matched_count(result) == FIELD_COUNT
+
+@pytest.mark.parametrize("outline", [None, 'open', 'closed', 'text'])
+@pytest.mark.parametrize("border", [1, 2])
+def test_field_detection_matches_contour_baseline(outline, border):
+    image = render_form(1920, 1080, border=border, outline=outline)
+    result = analyze(image)
+    fields = sorted(field['bbox'] for field in result['visual_features']['potential_fields'])
+    assert fields == baseline_fields(image)
+
+def test_open_outline_keeps_inner_fields():
+    result = analyze(render_form(1920, 1080, border=2, outline='open'))
+    assert len(result['visual_features']['potential_fields']) == FIELD_COUNT
+    assert matched_count(result) == FIELD_COUNT
@@ -1978,20 +1978,14 @@ class JobFormDetector {
                 return;
             }
             
-            const fileData = await response.json();
-            if (!fileData.success) {
-                console.error('Failed to get resume file data');
-                return;
-            }
-            
-            // Convert base64 to blob
-            const byteCharacters = atob(fileData.file_data);
-            const byteNumbers = new Array(byteCharacters.length);
-            for (let i = 0; i < byteCharacters.length; i++) {
-                byteNumbers[i] = byteCharacters.charCodeAt(i);
-            }
-            const byteArray = new Uint8Array(byteNumbers);
-            const blob = new Blob([byteArray], { type: fileData.content_type });
+            // Response body is the raw file; the filename comes from Content-Disposition
+            const blob = await response.blob();
+            const disposition = response.headers.get('Content-Disposition') || '';
+            const filenameMatch = disposition.match(/filename\*=UTF-8''([^;]+)/i);
+            const fileData = {
+                filename: filenameMatch ? decodeURIComponent(filenameMatch[1]) : 'resume',
+                content_type: blob.type || 'application/octet-stream'
+            };
             
             // Create File object
             const file = new File([blob], fileData.filename, { 